@@ -0,0 +1,55 @@
+"""Gunicorn server profile, every value can be overridden from the env."""
+import multiprocessing
+import os
+
+wsgi_app = os.getenv('GUNICORN_APP', 'task_manager.asgi:application')
+bind = os.getenv('GUNICORN_BIND', f'0.0.0.0:{os.getenv("PORT", "8000")}')
+
+# Async views run on uvicorn workers, use "gthread" for the WSGI app.
+worker_class = os.getenv(
+    'GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker'
+)
+workers = int(os.getenv(
+    'WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1
+))
+# Only used by the gthread worker.
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# Import Django once in the master, workers are forked from it.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Recycle workers to bound memory growth, the jitter keeps them from
+# restarting all at once.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    """Load the translation catalogs in the master before workers fork."""
+    if not preload_app:
+        return
+    from django.conf import settings
+    from django.utils import translation
+
+    languages = {settings.LANGUAGE_CODE}
+    for path in settings.LOCALE_PATHS:
+        languages.update(os.listdir(path))
+    for language in languages:
+        with translation.override(language):
+            pass
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading must not be shared by workers.
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
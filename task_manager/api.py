@@ -0,0 +1,147 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.translation import gettext as _
+from django.views import View
+
+from task_manager.pagination import KeysetPaginationMixin
+from task_manager.versions.etags import version_etag
+from task_manager.versions.models import ModelVersion
+
+
+class ApiField:
+    """A JSON field read from ``path`` ("status__name" follows relations)."""
+
+    def __init__(self, path=None, related=None, prefetch=None, value=None):
+        self.path = path
+        self.related = related
+        self.prefetch = prefetch
+        self.value = value
+
+    def get_value(self, obj):
+        if self.value is not None:
+            return self.value(obj)
+        for attr in self.path.split('__'):
+            obj = getattr(obj, attr)
+            if obj is None:
+                return None
+        return obj
+
+
+class ApiLoginRequiredMixin:
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse(
+                {'error': _('You are not logged in! Please log in.')},
+                status=401,
+            )
+        return super().dispatch(request, *args, **kwargs)
+
+
+class ApiViewMixin:
+    """Read-only JSON views with ``fields=`` projection and conditional GET.
+
+    The ETag is built from the version stamps of ``version_models``, so a
+    matching If-None-Match is answered with 304 before the main query runs.
+    """
+    model = None
+    api_fields = {}
+    version_models = ()
+
+    def get_version_models(self):
+        return self.version_models or (self.model,)
+
+    def get_requested_fields(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.api_fields)
+        fields = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = set(fields) - set(self.api_fields)
+        if unknown:
+            raise ValueError(
+                _('Unknown fields: %s') % ', '.join(sorted(unknown))
+            )
+        return fields
+
+    def get_base_queryset(self):
+        return self.model._default_manager.all()
+
+    def project(self, queryset, fields):
+        specs = [self.api_fields[name] for name in fields]
+        columns = {'pk', *getattr(self, 'keyset_ordering', ())}
+        columns.update(spec.path for spec in specs if spec.path)
+        related = {spec.related for spec in specs if spec.related}
+        prefetch = [spec.prefetch for spec in specs if spec.prefetch]
+        if related:
+            queryset = queryset.select_related(*related)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only(*columns)
+
+    def serialize(self, obj, fields):
+        return {name: self.api_fields[name].get_value(obj) for name in fields}
+
+    def get(self, request, *args, **kwargs):
+        versions, last_modified = ModelVersion.objects.stamp(
+            *self.get_version_models()
+        )
+        etag = version_etag(request, versions)
+        last_modified = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            try:
+                fields = self.get_requested_fields()
+            except ValueError as error:
+                return self.json_response({'error': str(error)}, status=400)
+            response = self.get_data_response(fields)
+        if response.status_code in (200, 304):
+            response.headers['ETag'] = etag
+            if last_modified:
+                response.headers['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def json_response(self, data, status=200):
+        return JsonResponse(data, status=status, encoder=DjangoJSONEncoder)
+
+
+class ApiListView(ApiViewMixin, KeysetPaginationMixin, View):
+    filterset_class = None
+
+    def get_data_response(self, fields):
+        queryset = self.get_base_queryset()
+        if self.filterset_class is not None:
+            filterset = self.filterset_class(
+                self.request.GET, queryset=queryset, request=self.request
+            )
+            if not filterset.is_valid():
+                return self.json_response(
+                    {'error': filterset.errors}, status=400
+                )
+            queryset = filterset.qs
+        queryset = self.project(queryset, fields)
+        page_size = self.get_paginate_by(queryset)
+        _paginator, page, objects, _is_paginated = self.paginate_queryset(
+            queryset, page_size
+        )
+        return self.json_response({
+            'results': [self.serialize(obj, fields) for obj in objects],
+            'next': self.page_link(page, 'next_page_url'),
+            'previous': self.page_link(page, 'previous_page_url'),
+        })
+
+    def page_link(self, page, attr):
+        url = getattr(page, attr, None)
+        return self.request.build_absolute_uri(url) if url else None
+
+
+class ApiDetailView(ApiViewMixin, View):
+    def get_data_response(self, fields):
+        queryset = self.project(self.get_base_queryset(), fields)
+        obj = queryset.filter(pk=self.kwargs['pk']).first()
+        if obj is None:
+            return self.json_response({'error': _('Not found')}, status=404)
+        return self.json_response(self.serialize(obj, fields))
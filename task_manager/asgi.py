@@ -3,5 +3,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+# Persistent connections opened by async views are not closed at the end of
+# the request, they pile up until the server runs out. Use DB_POOL instead.
+os.environ.setdefault('CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
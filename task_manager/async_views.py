@@ -0,0 +1,104 @@
+from asgiref.sync import sync_to_async
+from django.contrib.messages import get_messages
+from django.http import Http404
+from django.utils.cache import get_conditional_response, \
+    patch_cache_control, patch_vary_headers
+from django.utils.translation import gettext as _
+from django.views import View
+from django.views.generic.base import ContextMixin, TemplateResponseMixin
+
+from task_manager.versions.etags import version_etag
+from task_manager.versions.models import ModelVersion
+
+
+def has_pending_messages(request):
+    return bool(len(get_messages(request)))
+
+
+class AsyncObjectMixin:
+    """Rows read with the async ORM, with conditional GET.
+
+    Pages get an ETag from the version stamps of ``version_models``, a
+    matching If-None-Match is answered with 304 before the main query runs
+    or the template renders. Every model the page shows, counters
+    included, must be listed; with none the page is always rendered.
+    """
+    # Pages only read, ReplicaRoutingMiddleware may serve them from replicas.
+    read_from_replica = True
+    model = None
+    queryset = None
+    context_object_name = None
+    version_models = ()
+    etag = None
+
+    def get_queryset(self):
+        if self.queryset is not None:
+            return self.queryset.all()
+        return self.model._default_manager.all()
+
+    async def aget_not_modified(self, request):
+        """A 304 response if the client has the current page, else None."""
+        request.user = await request.auser()
+        # A cached page would not show the pending flash messages.
+        if not self.version_models or \
+                await sync_to_async(has_pending_messages)(request):
+            return None
+        versions, _changed_at = await ModelVersion.objects.astamp(
+            *self.version_models
+        )
+        self.etag = version_etag(request, versions)
+        return get_conditional_response(request, etag=self.etag)
+
+    def add_validators(self, response):
+        if self.etag and response.status_code in (200, 304):
+            response.headers['ETag'] = self.etag
+            # Browsers keep the page but check it on every load.
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Cookie',))
+        return response
+
+
+class AsyncListView(AsyncObjectMixin, TemplateResponseMixin, ContextMixin,
+                    View):
+    """ListView counterpart that reads rows with the async ORM.
+
+    Only the database access is async, templates are rendered by the
+    handler in a worker thread as for any TemplateResponse.
+    """
+
+    async def get_list_context(self):
+        object_list = [obj async for obj in self.get_queryset().aiterator()]
+        return {'object_list': object_list,
+                self.context_object_name: object_list}
+
+    async def get(self, request, *args, **kwargs):
+        not_modified = await self.aget_not_modified(request)
+        if not_modified is not None:
+            return self.add_validators(not_modified)
+        context = self.get_context_data(**await self.get_list_context())
+        return self.add_validators(self.render_to_response(context))
+
+
+class AsyncDetailView(AsyncObjectMixin, TemplateResponseMixin, ContextMixin,
+                      View):
+    pk_url_kwarg = 'pk'
+
+    async def aget_object(self):
+        queryset = self.get_queryset()
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                _('No %(verbose_name)s found matching the query')
+                % {'verbose_name': queryset.model._meta.verbose_name}
+            )
+
+    async def get(self, request, *args, **kwargs):
+        not_modified = await self.aget_not_modified(request)
+        if not_modified is not None:
+            return self.add_validators(not_modified)
+        self.object = await self.aget_object()
+        name = self.context_object_name or self.object._meta.model_name
+        context = self.get_context_data(object=self.object,
+                                        **{name: self.object})
+        return self.add_validators(self.render_to_response(context))
@@ -0,0 +1,20 @@
+from task_manager.api import ApiDetailView, ApiField, ApiListView, \
+    ApiLoginRequiredMixin
+from task_manager.labels.models import Label
+
+
+class LabelApiMixin(ApiLoginRequiredMixin):
+    model = Label
+    api_fields = {
+        'id': ApiField('id'),
+        'name': ApiField('name'),
+        'created_at': ApiField('created_at'),
+    }
+
+
+class LabelApiListView(LabelApiMixin, ApiListView):
+    pass
+
+
+class LabelApiDetailView(LabelApiMixin, ApiDetailView):
+    pass
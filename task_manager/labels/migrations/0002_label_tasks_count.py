@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='label',
+            name='tasks_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='number of tasks'),
+        ),
+    ]
@@ -8,6 +8,10 @@ class Label(models.Model):
     created_at = models.DateTimeField(
         _('created datetime'), default=timezone.now
     )
+    # Maintained by task_manager.tasks.counters.
+    tasks_count = models.PositiveIntegerField(
+        _('number of tasks'), default=0, editable=False
+    )
 
     def __str__(self):
         return self.name
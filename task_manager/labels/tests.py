@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import ProtectedError
 from django.shortcuts import reverse
 from django.test import TestCase
 
@@ -19,6 +20,12 @@ class TestLabelListView(SetUpLoggedUserMixin, TestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
+    async def test_label_list_view_async_client(self):
+        await Label.objects.acreate(name='Async label')
+        await self.async_client.aforce_login(self.logged_user)
+        response = await self.async_client.get(self.url)
+        self.assertContains(response, 'Async label')
+
     def test_label_list_view_not_logged_in(self):
         self.client.logout()
         response = self.client.get(self.url)
@@ -123,6 +130,27 @@ class TestLabelDeleteView(SetUpLoggedUserMixin, TestCase):
 
         self.assertTrue(Label.objects.filter(name=self.test_label.name).exists())
 
+    def test_label_delete_view_post_using_in_task_queries(self):
+        task = Task.objects.create(
+            name='Test task',
+            status=Status.objects.create(name='Test status'),
+            creator=self.logged_user)
+        task.labels.set([self.test_label])
+        self.client.get(reverse('labels_list'))
+        # The session and the user, then the label.
+        with self.assertNumQueries(3):
+            self.client.post(self.url)
+
+    def test_label_delete_protected_by_task(self):
+        task = Task.objects.create(
+            name='Test task',
+            status=Status.objects.create(name='Test status'),
+            creator=self.logged_user)
+        task.labels.set([self.test_label])
+
+        with self.assertRaises(ProtectedError):
+            self.test_label.delete()
+
     def test_label_delete_view_get_not_logged_in(self):
         self.client.logout()
         response = self.client.get(self.url)
@@ -134,3 +162,31 @@ class TestLabelDeleteView(SetUpLoggedUserMixin, TestCase):
         self.assertRedirects(response, settings.LOGIN_URL)
 
         self.assertTrue(Label.objects.filter(name=self.test_label.name).exists())
+
+
+class TestLabelApiViews(SetUpLoggedUserMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.test_label = Label.objects.create(name='Test label')
+        cls.url = reverse('labels_api')
+
+    def test_label_api_list(self):
+        response = self.client.get(self.url, {'fields': 'name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn({'name': self.test_label.name}, response.json()['results'])
+
+    def test_label_api_detail(self):
+        url = reverse('label_api_detail', kwargs={'pk': self.test_label.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.json()['name'], self.test_label.name)
+
+    def test_label_api_not_modified(self):
+        etag = self.client.get(self.url).headers['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Label.objects.create(name='Other label')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -1,5 +1,6 @@
 from django.urls import path
 
+from task_manager.labels.api import LabelApiListView, LabelApiDetailView
 from task_manager.labels.views import LabelListView, LabelCreateView, \
     LabelUpdateView, LabelDeleteView
 
@@ -8,4 +9,7 @@ urlpatterns = [
     path('create/', LabelCreateView.as_view(), name='label_create'),
     path('<int:pk>/update/', LabelUpdateView.as_view(), name='label_update'),
     path('<int:pk>/delete/', LabelDeleteView.as_view(), name='label_delete'),
+    path('api/', LabelApiListView.as_view(), name='labels_api'),
+    path('api/<int:pk>/', LabelApiDetailView.as_view(),
+         name='label_api_detail'),
 ]
@@ -1,18 +1,21 @@
-from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
-from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext as _
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.views.generic import CreateView, UpdateView, DeleteView
 
 from task_manager.labels.models import Label
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.tasks.models import Task
+from task_manager.async_views import AsyncListView
+from task_manager.mixins import AsyncLoginRequiredMixin, \
+    CustomLoginRequiredMixin, ProtectedDeleteMixin
 
 
-class LabelListView(CustomLoginRequiredMixin, ListView):
+class LabelListView(AsyncLoginRequiredMixin, AsyncListView):
     model = Label
     template_name = 'labels/list.html'
     context_object_name = 'labels'
+    # Tasks change the counts shown.
+    version_models = (Label, Task)
 
 
 class LabelCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
@@ -31,16 +34,12 @@ class LabelUpdateView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView)
     success_message = _('The label has been successfully changed')
 
 
-class LabelDeleteView(CustomLoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class LabelDeleteView(CustomLoginRequiredMixin, ProtectedDeleteMixin,
+                      SuccessMessageMixin, DeleteView):
     model = Label
     template_name = 'labels/delete.html'
     success_url = reverse_lazy('labels_list')
     success_message = _('The label has been successfully deleted')
-
-    def post(self, request, *args, **kwargs):
-        if self.get_object().tasks.exists():
-            messages.error(
-                self.request,
-                _('Unable to delete a label because it is being used'))
-            return redirect('labels_list')
-        return super().post(request, *args, **kwargs)
+    protected_message = _('Unable to delete a label because it is being used')
+    protected_url = reverse_lazy('labels_list')
+    protected_counters = ('tasks_count',)
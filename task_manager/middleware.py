@@ -0,0 +1,264 @@
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, \
+    sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import got_request_exception
+from django.db import connections
+
+from task_manager import reporting
+from task_manager.routers import Routing, routing
+
+logger = logging.getLogger('task_manager.performance')
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+    def duplicates(self):
+        threshold = settings.REQUEST_INSTRUMENTATION_DUPLICATE_THRESHOLD
+        return {
+            sql: count for sql, count in self.statements.most_common()
+            if count >= threshold
+        }
+
+
+def pool_wait():
+    """Seconds the pooled connections of this thread waited for the pool."""
+    return sum(
+        getattr(connection, 'pool_wait', 0.0)
+        for connection in connections.all()
+    )
+
+
+def pool_stats():
+    return {
+        connection.alias: connection.pool.stats()
+        for connection in connections.all()
+        if hasattr(connection, 'pool_wait')
+    }
+
+
+class Measurement:
+    def __init__(self, request):
+        request._render_time = 0.0
+        self.recorder = QueryRecorder()
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.pool_wait = pool_wait()
+        self.pools = {}
+        self.stack = ExitStack()
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self.recorder))
+
+    def close(self):
+        self.stack.close()
+        self.total = time.perf_counter() - self.started
+        self.pool_wait = pool_wait() - self.pool_wait
+        self.pools = pool_stats()
+
+
+class RequestInstrumentationMiddleware:
+    """Per-request query count, DB time, N+1 signatures and render time.
+
+    Enabled with REQUEST_INSTRUMENTATION, only a share of requests given by
+    REQUEST_INSTRUMENTATION_SAMPLE_RATE is measured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        measurement = Measurement(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            measurement.close()
+        return self.finish(request, measurement, response)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        # Connections are thread-local, wrap them in the thread that runs
+        # the sync and async ORM calls of this request.
+        measurement = await sync_to_async(Measurement)(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(measurement.close)()
+        return self.finish(request, measurement, response)
+
+    def finish(self, request, measurement, response):
+        recorder = measurement.recorder
+        metrics = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 3),
+            'render_ms': round(request._render_time * 1000, 3),
+            'total_ms': round(measurement.total * 1000, 3),
+            'duplicates': recorder.duplicates(),
+        }
+        if measurement.pools:
+            metrics['pool_wait_ms'] = round(measurement.pool_wait * 1000, 3)
+            metrics['pools'] = measurement.pools
+        response.headers['Server-Timing'] = self.server_timing(metrics)
+        logger.info(json.dumps(metrics))
+        return response
+
+    def process_template_response(self, request, response):
+        if not hasattr(request, '_render_time'):
+            return response
+        started = time.perf_counter()
+
+        def finish_render(rendered):
+            request._render_time += time.perf_counter() - started
+
+        response.add_post_render_callback(finish_render)
+        return response
+
+    @staticmethod
+    def server_timing(metrics):
+        entries = [
+            f'db;dur={metrics["db_ms"]};desc="{metrics["queries"]} queries"',
+            f'dup;desc="{len(metrics["duplicates"])} repeated queries"',
+            f'render;dur={metrics["render_ms"]}',
+            f'total;dur={metrics["total_ms"]}',
+        ]
+        for alias, stats in metrics.get('pools', {}).items():
+            entries.append(
+                f'pool-{alias};dur={metrics["pool_wait_ms"]};'
+                f'desc="{stats["checked_out"]} checked out, '
+                f'{stats["waiting"]} waiting"'
+            )
+        return ', '.join(entries)
+
+
+class ReplicaRoutingMiddleware:
+    """Send the reads of read-only views to replicas.
+
+    Views opt in with ``read_from_replica = True``. A request that writes
+    sets a cookie that keeps the client on the primary for
+    REPLICA_PIN_SECONDS, so the page it is redirected to shows its change.
+    """
+
+    cookie_name = 'primary_pin'
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing.reset(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        state, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing.reset(token)
+        return self.finish(state, response)
+
+    def start(self, request):
+        state = Routing(pinned=self.cookie_name in request.COOKIES)
+        return state, routing.set(state)
+
+    def finish(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        read_only = getattr(view_class, 'read_from_replica', False)
+        routing.get().use_replica = read_only and request.method in (
+            'GET', 'HEAD'
+        )
+
+
+class ErrorReportingMiddleware:
+    """Hand errors and slow requests to the reporting queue.
+
+    Reports are sent by the queue thread, a slow or unreachable reporting
+    backend never delays the response. Enabled when ERROR_REPORTING has a
+    sink, slow requests are reported above SLOW_REQUEST_MS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if reporting.get_queue() is None:
+            raise MiddlewareNotUsed
+        got_request_exception.connect(
+            reporting.report_exception, dispatch_uid='error_reporting'
+        )
+        self.get_response = get_response
+        self.slow = settings.ERROR_REPORTING['SLOW_REQUEST_MS'] / 1000
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        return self.finish(request, response, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        return self.finish(request, response, started)
+
+    def finish(self, request, response, started):
+        duration = time.perf_counter() - started
+        if self.slow and duration >= self.slow:
+            reporting.report_slow_request(request, response, duration)
+        return response
@@ -1,5 +1,7 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Exists, OuterRef, PROTECT, ProtectedError
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.translation import gettext as _
@@ -9,3 +11,77 @@ class CustomLoginRequiredMixin(LoginRequiredMixin):
     def handle_no_permission(self):
         messages.error(self.request, _('You are not logged in! Please log in.'))
         return redirect(reverse('login'))
+
+
+class AsyncLoginRequiredMixin(CustomLoginRequiredMixin):
+    """Login check for async views, the user is loaded with the async ORM."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Replacing the lazy object keeps templates from loading it again.
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+def protected_relations_exist(model):
+    """One expression that is true if any PROTECT relation points at a row."""
+    condition = None
+    for relation in model._meta.related_objects:
+        if relation.on_delete is not PROTECT:
+            continue
+        exists = Exists(relation.related_model._base_manager.filter(
+            **{relation.field.name: OuterRef('pk')}
+        ))
+        condition = exists if condition is None else condition | exists
+    return condition
+
+
+class ProtectedDeleteMixin:
+    """DeleteView mixin that refuses to delete objects still in use.
+
+    With ``protected_counters`` the guard reads maintained counter columns
+    ("profile__created_tasks_count" follows relations), otherwise the object
+    is loaded with a single EXISTS check over all PROTECT relations.
+    ProtectedError from delete() remains the source of truth, so a row
+    referenced after the check is still not deleted.
+    """
+    protected_message = None
+    protected_url = None
+    protected_counters = ()
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_object'):
+            if queryset is None:
+                queryset = self.get_queryset()
+            condition = protected_relations_exist(self.model)
+            if condition is not None and not self.protected_counters:
+                queryset = queryset.annotate(is_protected=condition)
+            self._object = super().get_object(queryset)
+        return self._object
+
+    def get_counter(self, path):
+        value = self.object
+        try:
+            for attr in path.split('__'):
+                value = getattr(value, attr)
+        except ObjectDoesNotExist:
+            return 0
+        return value
+
+    def is_protected(self):
+        if self.protected_counters:
+            return any(self.get_counter(path) for path in self.protected_counters)
+        return getattr(self.object, 'is_protected', False)
+
+    def protected_response(self):
+        messages.error(self.request, self.protected_message)
+        return redirect(self.protected_url)
+
+    def form_valid(self, form):
+        if self.is_protected():
+            return self.protected_response()
+        try:
+            return super().form_valid(form)
+        except ProtectedError:
+            return self.protected_response()
@@ -0,0 +1,91 @@
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from task_manager.outbox.models import OutboxMessage
+from task_manager.outbox.worker import OutboxWorker
+
+logger = logging.getLogger('task_manager.outbox')
+
+
+class Command(BaseCommand):
+    help = ('Deliver the outbox messages to WEBHOOK_URL until stopped, '
+            'reporting throughput and lag.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--max-attempts', type=int, default=10)
+        parser.add_argument('--backoff', type=float, default=1,
+                            help='Seconds before the first retry, doubled '
+                                 'after each failure.')
+        parser.add_argument('--max-backoff', type=float, default=3600)
+        parser.add_argument('--poll-interval', type=float, default=1)
+        parser.add_argument('--report-interval', type=float, default=60)
+        parser.add_argument('--once', action='store_true',
+                            help='Exit when no message is due.')
+        parser.add_argument('--retry-given-up', action='store_true',
+                            help='Queue the given up messages again first.')
+
+    def handle(self, *args, **options):
+        if not settings.WEBHOOK_URL:
+            raise CommandError('WEBHOOK_URL is not set.')
+        if options['retry_given_up']:
+            retried = OutboxMessage.objects.filter(
+                available_at__isnull=True
+            ).update(available_at=timezone.now(), attempts=0)
+            self.stdout.write(f'Retrying {retried} given up messages.')
+
+        worker = OutboxWorker(
+            settings.WEBHOOK_URL,
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+            timeout=settings.WEBHOOK_TIMEOUT,
+            max_attempts=options['max_attempts'],
+            backoff=options['backoff'],
+            max_backoff=options['max_backoff'],
+        )
+        self.running = True
+        previous = signal.signal(signal.SIGTERM, self.stop)
+        try:
+            self.run(worker, options)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            worker.close()
+            self.stdout.write(worker.report())
+
+    def stop(self, signum, frame):
+        self.running = False
+
+    def attempt(self, action, default):
+        """Run one step, a bad batch or a lost database is only logged."""
+        # Drops a broken connection before the next query.
+        close_old_connections()
+        try:
+            return action()
+        except Exception:
+            # Claimed messages are retried once their lease expires.
+            logger.exception('Outbox worker step failed')
+            return default
+
+    def run(self, worker, options):
+        reported = time.monotonic()
+        while self.running:
+            claimed = self.attempt(worker.run_batch, 0)
+            if time.monotonic() - reported >= options['report_interval']:
+                report = self.attempt(worker.report, None)
+                if report:
+                    self.stdout.write(report)
+                reported = time.monotonic()
+            if claimed:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
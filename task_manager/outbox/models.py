@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+
+class OutboxMessageManager(models.Manager):
+    def publish(self, messages):
+        """Queue ``(topic, payload)`` pairs in the current transaction.
+
+        Nothing is written while no webhook receives them.
+        """
+        if not settings.WEBHOOK_URL:
+            return []
+        return self.bulk_create(
+            self.model(topic=topic, payload=payload)
+            for topic, payload in messages
+        )
+
+    def claim(self, batch_size, lease):
+        """Lease up to ``batch_size`` due messages to the caller.
+
+        Rows locked by another worker are skipped, the lease makes the
+        messages due again if this worker dies before finishing them.
+        """
+        now = timezone.now()
+        with transaction.atomic(using=self.db):
+            messages = list(self.select_for_update(skip_locked=True).filter(
+                available_at__lte=now
+            ).order_by('available_at', 'id')[:batch_size])
+            self.filter(pk__in=[message.pk for message in messages]).update(
+                available_at=now + lease
+            )
+        return messages
+
+
+class OutboxMessage(models.Model):
+    """A change waiting to be delivered to the webhook."""
+    id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=64)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+    # Next delivery attempt, NULL once the message was given up on.
+    available_at = models.DateTimeField(null=True, default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    objects = OutboxMessageManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['available_at', 'id'],
+                name='outbox_due_idx',
+                condition=Q(available_at__isnull=False),
+            ),
+        ]
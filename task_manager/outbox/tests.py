@@ -0,0 +1,163 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings
+
+from task_manager.outbox.models import OutboxMessage
+from task_manager.outbox.worker import OutboxWorker
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import apply_bulk_action
+from task_manager.tasks.models import Task
+from task_manager.tests import SetUpLoggedUserMixin
+
+
+class StubReceiver(ThreadingHTTPServer):
+    """Local webhook receiver, fails the first ``failures`` requests.
+
+    The first ``garbled`` requests get a response that is not HTTP.
+    """
+    request_queue_size = 64
+
+    def __init__(self, failures=0, garbled=0):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.failures = failures
+        self.garbled = garbled
+        self.received = []
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/hook'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.server.garbled:
+            self.server.garbled -= 1
+            self.wfile.write(b'garbled\r\n\r\n')
+            return
+        if self.server.failures:
+            self.server.failures -= 1
+            self.send_response(503)
+        else:
+            self.server.received.append(
+                (self.headers['Idempotency-Key'], json.loads(body))
+            )
+            self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(WEBHOOK_URL='http://127.0.0.1:9/hook')
+class TestOutbox(SetUpLoggedUserMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.status = Status.objects.create(name='Status')
+
+    def run_worker(self, receiver, *args):
+        out = StringIO()
+        with override_settings(WEBHOOK_URL=receiver.url):
+            call_command('run_outbox_worker', '--once', '--backoff', '0',
+                         *args, stdout=out)
+        return out.getvalue()
+
+    def create_task(self):
+        self.client.post(reverse('task_create'), {
+            'name': 'Hooked', 'status': self.status.pk,
+            'executor': self.logged_user.pk,
+        })
+        return Task.objects.get(name='Hooked')
+
+    def test_task_changes_are_queued_with_the_change(self):
+        task = self.create_task()
+        apply_bulk_action(Task.objects.all(), 'executor', None)
+        self.client.post(reverse('task_delete', kwargs={'pk': task.pk}))
+        self.assertEqual(
+            list(OutboxMessage.objects.order_by('pk').values_list(
+                'topic', 'payload__task'
+            )),
+            [('task.created', task.pk), ('task.reassigned', task.pk),
+             ('task.deleted', task.pk)],
+        )
+
+    @override_settings(WEBHOOK_URL=None)
+    def test_nothing_is_queued_without_webhook(self):
+        self.create_task()
+        self.assertFalse(OutboxMessage.objects.exists())
+        with self.assertRaises(CommandError):
+            call_command('run_outbox_worker', '--once', stdout=StringIO())
+
+    def test_worker_delivers_and_retries(self):
+        task = self.create_task()
+        with StubReceiver(failures=2) as receiver:
+            out = self.run_worker(receiver)
+        message_id, body = receiver.received[0]
+        self.assertEqual(body['id'], int(message_id))
+        self.assertEqual(body['topic'], 'task.created')
+        self.assertEqual(body['data']['task'], task.pk)
+        self.assertIn('delivered 1', out)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_worker_gives_up_after_max_attempts(self):
+        self.create_task()
+        with StubReceiver(failures=3) as receiver:
+            out = self.run_worker(receiver, '--max-attempts', '2')
+        self.assertEqual(receiver.received, [])
+        self.assertIn('given up 1', out)
+        message = OutboxMessage.objects.get()
+        self.assertIsNone(message.available_at)
+        self.assertEqual(message.attempts, 2)
+        self.assertIn('503', message.last_error)
+
+        with StubReceiver() as receiver:
+            self.run_worker(receiver, '--retry-given-up')
+        self.assertEqual(len(receiver.received), 1)
+
+    def test_worker_retries_malformed_responses(self):
+        self.create_task()
+        with StubReceiver(garbled=1) as receiver:
+            out = self.run_worker(receiver)
+        self.assertEqual(len(receiver.received), 1)
+        self.assertIn('delivered 1', out)
+
+    def test_worker_survives_failed_batches(self):
+        self.create_task()
+        batches = mock.patch.object(
+            OutboxWorker, 'run_batch',
+            side_effect=OperationalError('server closed the connection'),
+        )
+        with StubReceiver() as receiver, batches, \
+                self.assertLogs('task_manager.outbox', 'ERROR') as logs:
+            out = self.run_worker(receiver, '--report-interval', '0')
+        self.assertIn('server closed the connection', logs.output[0])
+        self.assertIn('delivered 0', out)
+
+    def test_worker_claims_due_messages_in_batches(self):
+        OutboxMessage.objects.publish(
+            ('task.updated', {'task': pk}) for pk in range(25)
+        )
+        with StubReceiver() as receiver:
+            out = self.run_worker(receiver, '--batch-size', '10',
+                                  '--concurrency', '4')
+        self.assertEqual(sorted(body['data']['task']
+                                for _key, body in receiver.received),
+                         list(range(25)))
+        self.assertIn('delivered 25', out)
@@ -0,0 +1,136 @@
+import http.client
+import json
+import logging
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Min
+from django.utils import timezone
+
+from task_manager.outbox.models import OutboxMessage
+
+logger = logging.getLogger('task_manager.outbox')
+
+
+def post(url, message, timeout):
+    """Deliver one message, any non-2xx response raises."""
+    body = json.dumps({
+        'id': message.pk,
+        'topic': message.topic,
+        'created_at': message.created_at,
+        'data': message.payload,
+    }, cls=DjangoJSONEncoder).encode()
+    request = urllib.request.Request(url, data=body, method='POST', headers={
+        'Content-Type': 'application/json',
+        # Deliveries are at least once, receivers drop repeated keys.
+        'Idempotency-Key': str(message.pk),
+    })
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+
+
+class OutboxWorker:
+    """Deliver claimed outbox messages concurrently, with retries.
+
+    A failed message is retried after an exponential backoff with jitter,
+    and parked (``available_at`` is NULL) after ``max_attempts``.
+    """
+
+    def __init__(self, url, batch_size=100, concurrency=8, timeout=5,
+                 max_attempts=10, backoff=1, max_backoff=3600, lease=None):
+        self.url = url
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Long enough for a whole batch to time out one after another.
+        self.lease = lease or timedelta(
+            seconds=timeout * (batch_size // concurrency + 1) + 30
+        )
+        self.executor = ThreadPoolExecutor(concurrency)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.started = time.monotonic()
+        self.stats = {'delivered': 0, 'retried': 0, 'given_up': 0,
+                      'lag': timedelta()}
+
+    def send(self, message):
+        try:
+            post(self.url, message, self.timeout)
+        except (OSError, ValueError, http.client.HTTPException) as error:
+            return str(error) or error.__class__.__name__
+        except Exception as error:
+            logger.exception('Failed to deliver outbox message %s',
+                             message.pk)
+            return repr(error)
+
+    def retry_at(self, now, attempts):
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        return now + timedelta(seconds=delay * random.uniform(0.5, 1))
+
+    def run_batch(self):
+        """Claim and deliver one batch, return the number of messages."""
+        messages = OutboxMessage.objects.claim(self.batch_size, self.lease)
+        errors = list(self.executor.map(self.send, messages))
+        now = timezone.now()
+        delivered = [message for message, error in zip(messages, errors)
+                     if error is None]
+        failed = []
+        for message, error in zip(messages, errors):
+            if error is not None:
+                message.attempts += 1
+                message.last_error = error
+                message.available_at = (
+                    self.retry_at(now, message.attempts)
+                    if message.attempts < self.max_attempts else None
+                )
+                failed.append(message)
+        OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in delivered]
+        ).delete()
+        OutboxMessage.objects.bulk_update(
+            failed, ['attempts', 'last_error', 'available_at']
+        )
+        self.count(now, delivered, failed)
+        return len(messages)
+
+    def count(self, now, delivered, failed):
+        given_up = sum(message.available_at is None for message in failed)
+        self.stats['delivered'] += len(delivered)
+        self.stats['retried'] += len(failed) - given_up
+        self.stats['given_up'] += given_up
+        self.stats['lag'] = max([
+            self.stats['lag'],
+            *(now - message.created_at for message in delivered),
+        ])
+
+    def report(self):
+        """Throughput and lag since the last report.
+
+        The lag is the age of the oldest delivered message, the backlog the
+        age of the oldest one still waiting.
+        """
+        elapsed = time.monotonic() - self.started
+        stats = self.stats
+        oldest = OutboxMessage.objects.filter(
+            available_at__isnull=False
+        ).aggregate(oldest=Min('created_at'))['oldest']
+        backlog = timezone.now() - oldest if oldest else timedelta()
+        line = (
+            f"delivered {stats['delivered']} "
+            f"({stats['delivered'] / elapsed if elapsed else 0:.1f}/s), "
+            f"retried {stats['retried']}, given up {stats['given_up']}, "
+            f"max lag {stats['lag'].total_seconds():.1f}s, "
+            f"backlog {backlog.total_seconds():.1f}s"
+        )
+        self.reset_stats()
+        return line
+
+    def close(self):
+        self.executor.shutdown()
@@ -0,0 +1,159 @@
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.http import Http404
+from django.utils.translation import gettext as _
+
+CURSOR_SALT = 'task_manager.pagination.cursor'
+
+
+def encode_cursor(values, reverse=False):
+    values = [
+        value.isoformat() if hasattr(value, 'isoformat') else value
+        for value in values
+    ]
+    return signing.dumps({'v': values, 'r': reverse}, salt=CURSOR_SALT)
+
+
+def decode_cursor(cursor):
+    try:
+        payload = signing.loads(cursor, salt=CURSOR_SALT)
+        return payload['v'], bool(payload['r'])
+    except (signing.BadSignature, KeyError, TypeError):
+        raise Http404(_('Invalid cursor'))
+
+
+def keyset_filter(ordering, values, reverse=False):
+    """Row-value comparison (f1, f2, ...) > (v1, v2, ...) as OR of ANDs.
+
+    A leading "-" marks a descending field, for which "after" means "less".
+    """
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') != reverse else 'gt'
+        step = Q(**{f'{name}__{lookup}': values[index]})
+        for prev_field, prev_value in zip(ordering[:index], values[:index]):
+            step &= Q(**{prev_field.lstrip('-'): prev_value})
+        condition |= step
+    return condition
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, per_page, ordering=('created_at', 'id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+
+    def _cursor_for(self, obj, reverse=False):
+        values = [getattr(obj, field.lstrip('-')) for field in self.ordering]
+        return encode_cursor(values, reverse=reverse)
+
+    def _seek(self, cursor):
+        queryset = self.queryset.order_by(*self.ordering)
+        if not cursor:
+            return queryset, False
+        values, reverse = decode_cursor(cursor)
+        if len(values) != len(self.ordering):
+            raise Http404(_('Invalid cursor'))
+        queryset = queryset.filter(
+            keyset_filter(self.ordering, values, reverse)
+        )
+        return (queryset.reverse() if reverse else queryset), reverse
+
+    def page(self, cursor=None):
+        queryset, reverse = self._seek(cursor)
+        return self._build_page(
+            list(queryset[:self.per_page + 1]), cursor, reverse
+        )
+
+    async def apage(self, cursor=None):
+        queryset, reverse = self._seek(cursor)
+        rows = [obj async for obj in queryset[:self.per_page + 1]]
+        return self._build_page(rows, cursor, reverse)
+
+    def _build_page(self, rows, cursor, reverse):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+        if not rows:
+            return KeysetPage(rows)
+
+        next_cursor = previous_cursor = None
+        if has_more or reverse:
+            next_cursor = self._cursor_for(rows[-1])
+        if cursor and (has_more or not reverse):
+            previous_cursor = self._cursor_for(rows[0], reverse=True)
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+class KeysetPaginationMixin:
+    """Cursor pagination for MultipleObjectMixin views, no OFFSET involved.
+
+    The page is selected by the signed ``cursor`` GET parameter and its
+    size by ``page_size``, capped at ``PAGINATION_MAX_PAGE_SIZE``.
+    """
+    cursor_kwarg = 'cursor'
+    page_size_kwarg = 'page_size'
+    keyset_ordering = ('created_at', 'id')
+
+    def get_paginate_by(self, queryset):
+        page_size = self.request.GET.get(self.page_size_kwarg)
+        try:
+            page_size = int(page_size)
+        except (TypeError, ValueError):
+            return settings.PAGINATION_PAGE_SIZE
+        return max(1, min(page_size, settings.PAGINATION_MAX_PAGE_SIZE))
+
+    def get_page_url(self, cursor):
+        query = self.request.GET.copy()
+        query[self.cursor_kwarg] = cursor
+        return f'?{query.urlencode()}'
+
+    def get_keyset_ordering(self, queryset):
+        return self.keyset_ordering
+
+    def get_paginator(self, queryset, page_size):
+        return KeysetPaginator(
+            queryset, page_size, self.get_keyset_ordering(queryset)
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return self._finish_page(paginator, page)
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+        return self._finish_page(paginator, page)
+
+    def _finish_page(self, paginator, page):
+        if page.has_next():
+            page.next_page_url = self.get_page_url(page.next_cursor)
+        if page.has_previous():
+            page.previous_page_url = self.get_page_url(page.previous_cursor)
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,82 @@
+import os
+import threading
+
+from django.db.backends.postgresql import base
+
+from task_manager.postgresql_pool.pool import ConnectionPool
+
+IDLE = 0  # psycopg2 TRANSACTION_STATUS_IDLE, psycopg TransactionStatus.IDLE
+
+
+def reset(connection):
+    if connection.closed:
+        return False
+    try:
+        if connection.info.transaction_status != IDLE:
+            connection.rollback()
+    except base.Database.Error:
+        return False
+    return True
+
+
+def check(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except base.Database.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that borrows connections from a process pool.
+
+    Configured with ``OPTIONS['pool']``, the key Django 5.1 uses for its
+    psycopg pool. Closing a connection returns it to the pool, so
+    ``CONN_MAX_AGE`` must be 0.
+    """
+
+    pools = {}
+    pools_lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_wait = 0.0
+        self._connection_pool = None
+
+    @property
+    def pool(self):
+        with self.pools_lock:
+            pool = self.pools.get(self.alias)
+            # Pools inherited from the gunicorn master are not reused.
+            if pool is None or pool.pid != os.getpid():
+                pool = self.pools[self.alias] = ConnectionPool(
+                    **self.settings_dict['OPTIONS'].get('pool', {})
+                )
+            return pool
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        connection, waited = pool.getconn(
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params
+            ),
+            check,
+        )
+        self.pool_wait += waited
+        self._connection_pool = pool
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            self._connection_pool.putconn(self.connection, reset)
+        # The connection now belongs to the pool, even inside an atomic
+        # block that Django will mark as closed.
+        self.connection = None
@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Connections shared by the threads of one process.
+
+    ``getconn`` hands out the most recently returned idle connection, opens
+    a new one while fewer than ``max_size`` are open, and otherwise waits up
+    to ``timeout`` seconds for one to be returned. Idle connections older
+    than ``check_after`` seconds are health-checked before reuse.
+    """
+
+    def __init__(self, max_size=10, timeout=30.0, check_after=10.0):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.pid = os.getpid()
+        self.condition = threading.Condition()
+        self.idle = []
+        self.size = 0
+        self.waiting = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def getconn(self, connect, check):
+        """Return a connection and the seconds spent waiting for it."""
+        waited = 0.0
+        while True:
+            connection, returned_at, wait = self._reserve()
+            waited += wait
+            if connection is None:
+                return self._open(connect), waited
+            idle_for = time.monotonic() - returned_at
+            if idle_for < self.check_after or check(connection):
+                return connection, waited
+            self.discard(connection)
+
+    def putconn(self, connection, reset):
+        """Take a connection back, ``reset`` returns False if it's broken."""
+        if os.getpid() != self.pid or not reset(connection):
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def stats(self):
+        with self.condition:
+            return {
+                'size': self.size,
+                'idle': len(self.idle),
+                'checked_out': self.size - len(self.idle),
+                'waiting': self.waiting,
+                'wait_ms': round(self.wait_time * 1000, 3),
+                'timeouts': self.timeouts,
+            }
+
+    def _reserve(self):
+        """Pop an idle connection, or reserve room for a new one (None)."""
+        started = time.monotonic()
+        with self.condition:
+            self.waiting += 1
+            try:
+                ready = self.condition.wait_for(
+                    lambda: self.idle or self.size < self.max_size,
+                    self.timeout,
+                )
+            finally:
+                self.waiting -= 1
+                wait = time.monotonic() - started
+                self.wait_time += wait
+            if not ready:
+                self.timeouts += 1
+                raise PoolTimeout(
+                    f'No connection available after {self.timeout} seconds.'
+                )
+            if self.idle:
+                return (*self.idle.pop(), wait)
+            self.size += 1
+            return None, None, wait
+
+    def _open(self, connect):
+        try:
+            return connect()
+        except BaseException:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
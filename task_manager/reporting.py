@@ -0,0 +1,214 @@
+import atexit
+import functools
+import hashlib
+import logging
+import os
+import sys
+import threading
+import traceback
+from collections import Counter, deque
+
+import rollbar
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('task_manager.performance')
+
+# Never copied into reports.
+PRIVATE_HEADERS = frozenset({'HTTP_AUTHORIZATION', 'HTTP_COOKIE'})
+
+
+class ReportQueue:
+    """Bounded in-process queue of reports, sent by a background thread.
+
+    ``put`` never blocks on the sink: when the queue is full the oldest
+    report is dropped and counted. The thread sends up to ``batch_size``
+    reports at once, waiting at most ``flush_interval`` for a batch to
+    fill up.
+    """
+
+    def __init__(self, sink, max_size=1000, batch_size=50,
+                 flush_interval=1.0):
+        self.sink = sink
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.reports = deque()
+        self.sending = 0
+        self.counters = Counter()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.pid = None
+
+    def put(self, report):
+        with self.condition:
+            if len(self.reports) >= self.max_size:
+                self.reports.popleft()
+                self.counters['dropped'] += 1
+            self.reports.append(report)
+            self.counters['queued'] += 1
+            self.start()
+            self.condition.notify_all()
+
+    def start(self):
+        # Threads do not survive a fork, each worker starts its own.
+        if self.pid != os.getpid() or not self.thread.is_alive():
+            self.pid = os.getpid()
+            self.thread = threading.Thread(
+                target=self.run, name='report-queue', daemon=True
+            )
+            self.thread.start()
+
+    def take(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.reports)
+            self.condition.wait_for(
+                lambda: len(self.reports) >= self.batch_size,
+                timeout=self.flush_interval,
+            )
+            batch = [self.reports.popleft()
+                     for _ in range(min(self.batch_size, len(self.reports)))]
+            self.sending = len(batch)
+            return batch, self.counters['dropped']
+
+    def run(self):
+        dropped = 0
+        while True:
+            batch, dropped_now = self.take()
+            if dropped_now > dropped:
+                logger.warning('Dropped %d error reports, the queue is full',
+                               dropped_now - dropped)
+                dropped = dropped_now
+            try:
+                self.sink(batch)
+                outcome = 'sent'
+            except Exception:
+                logger.exception('Failed to send %d error reports',
+                                 len(batch))
+                outcome = 'failed'
+            with self.condition:
+                self.counters[outcome] += len(batch)
+                self.sending = 0
+                self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until every queued report was handed to the sink."""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.reports and not self.sending, timeout
+            )
+
+    def stats(self):
+        with self.condition:
+            return {
+                'size': len(self.reports),
+                **{name: self.counters[name]
+                   for name in ('queued', 'sent', 'failed', 'dropped')},
+            }
+
+
+@functools.cache
+def get_queue():
+    """The process-wide queue, None when reporting is disabled."""
+    options = settings.ERROR_REPORTING
+    if not options['SINK']:
+        return None
+    queue = ReportQueue(
+        import_string(options['SINK']),
+        max_size=options['QUEUE_SIZE'],
+        batch_size=options['BATCH_SIZE'],
+        flush_interval=options['FLUSH_INTERVAL'],
+    )
+    atexit.register(queue.flush, options['SHUTDOWN_TIMEOUT'])
+    return queue
+
+
+def reset_queue(setting, **kwargs):
+    if setting == 'ERROR_REPORTING':
+        get_queue.cache_clear()
+
+
+setting_changed.connect(reset_queue)
+
+
+def request_data(request):
+    """The parts of a request kept in a report, it outlives the request."""
+    return {
+        'url': request.get_full_path(),
+        'method': request.method,
+        'user_ip': request.META.get('REMOTE_ADDR'),
+        'headers': {
+            name[5:].replace('_', '-').title(): value
+            for name, value in request.META.items()
+            if name.startswith('HTTP_') and name not in PRIVATE_HEADERS
+        },
+    }
+
+
+def report_exception(sender, request=None, **kwargs):
+    """Queue the exception being handled, connected to got_request_exception.
+
+    Only the extracted traceback is queued, a queued traceback would keep
+    the frames and their locals alive until the report is sent.
+    """
+    queue = get_queue()
+    if queue is not None:
+        queue.put({
+            'exception': traceback.TracebackException(
+                *sys.exc_info(), capture_locals=False
+            ),
+            'request': request and request_data(request),
+        })
+
+
+def report_slow_request(request, response, duration):
+    queue = get_queue()
+    if queue is not None:
+        queue.put({
+            'message': f'Slow request: {request.method} {request.path}',
+            'request': request_data(request),
+            'extra': {'status': response.status_code,
+                      'duration_ms': round(duration * 1000, 3)},
+        })
+
+
+@functools.cache
+def init_rollbar():
+    options = dict(settings.ROLLBAR)
+    # Reports are already sent from the queue thread.
+    options['handler'] = 'blocking'
+    rollbar.init(options.pop('access_token'), options.pop('environment'),
+                 **options)
+
+
+def exception_payload(exception):
+    """Title and grouping of an exception sent as a formatted traceback.
+
+    Occurrences are grouped by the exception class and the functions on the
+    stack, as Rollbar does for the exceptions it extracts itself.
+    """
+    name = exception.exc_type.__qualname__
+    stack = ''.join(f'{frame.filename}:{frame.name}\n'
+                    for frame in exception.stack)
+    return {
+        'title': f'{name}: {exception}'[:255],
+        'fingerprint': hashlib.sha1(f'{name}\n{stack}'.encode()).hexdigest(),
+    }
+
+
+def rollbar_sink(reports):
+    init_rollbar()
+    for report in reports:
+        payload_data = {'request': report['request']} \
+            if report['request'] else {}
+        if 'exception' in report:
+            exception = report['exception']
+            rollbar.report_message(
+                ''.join(exception.format()), 'error',
+                payload_data={**payload_data, **exception_payload(exception)},
+            )
+        else:
+            rollbar.report_message(report['message'], 'warning',
+                                   extra_data=report['extra'],
+                                   payload_data=payload_data or None)
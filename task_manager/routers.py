@@ -0,0 +1,52 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+routing = ContextVar('routing', default=None)
+
+
+class Routing:
+    """Routing decisions of the current request.
+
+    ``use_replica`` is switched on by the middleware for read-only views,
+    ``wrote`` records that the request changed data.
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.use_replica = False
+        self.wrote = False
+
+    @property
+    def reads_from_replica(self):
+        return self.use_replica and not (self.pinned or self.wrote)
+
+
+class PrimaryReplicaRouter:
+    """Writes go to the primary, reads of read-only views to a replica.
+
+    Outside a request, or once the request or the client wrote, every
+    query goes to the primary so it sees its own changes.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = routing.get()
+        if settings.DATABASE_REPLICAS and state and state.reads_from_replica:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = routing.get()
+        if state:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
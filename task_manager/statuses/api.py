@@ -0,0 +1,20 @@
+from task_manager.api import ApiDetailView, ApiField, ApiListView, \
+    ApiLoginRequiredMixin
+from task_manager.statuses.models import Status
+
+
+class StatusApiMixin(ApiLoginRequiredMixin):
+    model = Status
+    api_fields = {
+        'id': ApiField('id'),
+        'name': ApiField('name'),
+        'created_at': ApiField('created_at'),
+    }
+
+
+class StatusApiListView(StatusApiMixin, ApiListView):
+    pass
+
+
+class StatusApiDetailView(StatusApiMixin, ApiDetailView):
+    pass
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0002_status_tasks_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='status',
+            name='is_closed',
+            field=models.BooleanField(default=False, verbose_name='closed'),
+        ),
+    ]
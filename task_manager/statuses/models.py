@@ -8,6 +8,12 @@ class Status(models.Model):
     created_at = models.DateTimeField(
         _('created datetime'), default=timezone.now
     )
+    # Tasks in a closed status count as done on the dashboard.
+    is_closed = models.BooleanField(_('closed'), default=False)
+    # Maintained by task_manager.tasks.counters.
+    tasks_count = models.PositiveIntegerField(
+        _('number of tasks'), default=0, editable=False
+    )
 
     def __str__(self):
         return self.name
@@ -19,6 +19,26 @@ class TestStatusListView(SetUpLoggedUserMixin, TestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
+    async def test_status_list_view_async_client(self):
+        await Status.objects.acreate(name='Async status')
+        await self.async_client.aforce_login(self.logged_user)
+        response = await self.async_client.get(self.url)
+        self.assertContains(response, 'Async status')
+
+    def test_status_list_view_not_modified(self):
+        etag = self.client.get(self.url).headers['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # The counts shown change with the tasks.
+        status = Status.objects.create(name='Counted')
+        etag = self.client.get(self.url).headers['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(name='Counted task', status=status,
+                                creator=self.logged_user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
     def test_status_list_view_not_logged_in(self):
         self.client.logout()
         response = self.client.get(self.url)
@@ -120,6 +140,14 @@ class TestStatusDeleteView(SetUpLoggedUserMixin, TestCase):
 
         self.assertTrue(Status.objects.filter(name=self.test_status.name).exists())
 
+    def test_status_delete_view_post_using_in_task_queries(self):
+        Task.objects.create(name='Test task', status=self.test_status,
+                            creator=self.logged_user)
+        self.client.get(reverse('statuses_list'))
+        # The session and the user, then the status.
+        with self.assertNumQueries(3):
+            self.client.post(self.url)
+
     def test_status_delete_view_get_not_logged_in(self):
         self.client.logout()
         response = self.client.get(self.url)
@@ -131,3 +159,31 @@ class TestStatusDeleteView(SetUpLoggedUserMixin, TestCase):
         self.assertRedirects(response, settings.LOGIN_URL)
 
         self.assertTrue(Status.objects.filter(name=self.test_status.name).exists())
+
+
+class TestStatusApiViews(SetUpLoggedUserMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.test_status = Status.objects.create(name='Test status')
+        cls.url = reverse('statuses_api')
+
+    def test_status_api_list(self):
+        response = self.client.get(self.url, {'fields': 'name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn({'name': self.test_status.name}, response.json()['results'])
+
+    def test_status_api_detail(self):
+        url = reverse('status_api_detail', kwargs={'pk': self.test_status.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.json()['name'], self.test_status.name)
+
+    def test_status_api_not_modified(self):
+        etag = self.client.get(self.url).headers['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name='Other status')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -1,5 +1,6 @@
 from django.urls import path
 
+from .api import StatusApiListView, StatusApiDetailView
 from .views import StatusListView, StatusCreateView, \
     StatusUpdateView, StatusDeleteView
 
@@ -8,4 +9,7 @@ urlpatterns = [
     path('create/', StatusCreateView.as_view(), name='status_create'),
     path('<int:pk>/update/', StatusUpdateView.as_view(), name='status_update'),
     path('<int:pk>/delete/', StatusDeleteView.as_view(), name='status_delete'),
+    path('api/', StatusApiListView.as_view(), name='statuses_api'),
+    path('api/<int:pk>/', StatusApiDetailView.as_view(),
+         name='status_api_detail'),
 ]
@@ -1,46 +1,45 @@
-from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
-from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext as _
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.views.generic import CreateView, UpdateView, DeleteView
 
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.async_views import AsyncListView
+from task_manager.mixins import AsyncLoginRequiredMixin, \
+    CustomLoginRequiredMixin, ProtectedDeleteMixin
 from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
 
 
-class StatusListView(CustomLoginRequiredMixin, ListView):
+class StatusListView(AsyncLoginRequiredMixin, AsyncListView):
     model = Status
     template_name = 'statuses/list.html'
     context_object_name = 'statuses'
+    # Tasks change the counts shown.
+    version_models = (Status, Task)
 
 
 class StatusCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Status
     template_name = 'statuses/create.html'
-    fields = ['name']
+    fields = ['name', 'is_closed']
     success_url = reverse_lazy('statuses_list')
     success_message = _('The status has been successfully created')
 
 
 class StatusUpdateView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView):
     model = Status
-    fields = ['name']
+    fields = ['name', 'is_closed']
     template_name = 'statuses/update.html'
     success_url = reverse_lazy('statuses_list')
     success_message = _('The status has been successfully changed')
 
 
-class StatusDeleteView(CustomLoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class StatusDeleteView(CustomLoginRequiredMixin, ProtectedDeleteMixin,
+                       SuccessMessageMixin, DeleteView):
     model = Status
     template_name = 'statuses/delete.html'
     success_url = reverse_lazy('statuses_list')
     success_message = _('The status has been successfully deleted')
-
-    def post(self, request, *args, **kwargs):
-        if self.get_object().tasks.exists():
-            messages.error(
-                self.request,
-                _('Unable to delete a status because it is being used'))
-            return redirect('statuses_list')
-        return super().post(request, *args, **kwargs)
+    protected_message = _('Unable to delete a status because it is being used')
+    protected_url = reverse_lazy('statuses_list')
+    protected_counters = ('tasks_count',)
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+
+from task_manager.api import ApiDetailView, ApiField, ApiListView, \
+    ApiLoginRequiredMixin
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.filters import TaskFilterSet
+from task_manager.tasks.models import Task
+from task_manager.tasks.views import TaskKeysetPaginationMixin
+
+
+class TaskApiMixin(ApiLoginRequiredMixin):
+    model = Task
+    version_models = (Task, Status, Label, get_user_model())
+    api_fields = {
+        'id': ApiField('id'),
+        'name': ApiField('name'),
+        'description': ApiField('description'),
+        'status': ApiField('status__name', related='status'),
+        'creator': ApiField('creator__username', related='creator'),
+        'executor': ApiField('executor__username', related='executor'),
+        'labels': ApiField(
+            prefetch=Prefetch('labels', queryset=Label.objects.only('name')),
+            value=lambda task: [label.name for label in task.labels.all()],
+        ),
+        'created_at': ApiField('created_at'),
+    }
+
+
+class TaskApiListView(TaskApiMixin, TaskKeysetPaginationMixin, ApiListView):
+    filterset_class = TaskFilterSet
+
+
+class TaskApiDetailView(TaskApiMixin, ApiDetailView):
+    pass
@@ -0,0 +1,105 @@
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from task_manager.tasks import counters, events, rollups
+from task_manager.tasks.models import Task, TaskLabel
+from task_manager.versions.models import ModelVersion
+
+# Rows delete_tasks() deletes before the tasks, the other relations to Task
+# must be DO_NOTHING (checked by checks.check_bulk_delete_relations).
+DELETED_RELATIONS = (TaskLabel,)
+
+
+def set_status(queryset, status, batch_size, actor):
+    events.save(events.field_events(queryset, 'status', status, actor),
+                batch_size)
+    counters.move_tasks(queryset, 'status_id', status.pk)
+    rollups.move_tasks(queryset, status)
+    return queryset.update(status=status, updated_at=timezone.now())
+
+
+def set_executor(queryset, executor, batch_size, actor):
+    events.save(events.field_events(queryset, 'executor', executor, actor),
+                batch_size)
+    counters.move_tasks(queryset, 'executor_id', executor and executor.pk)
+    return queryset.update(executor=executor, updated_at=timezone.now())
+
+
+def add_label(queryset, label, batch_size, actor):
+    events.save(events.label_events(queryset, label, True, actor),
+                batch_size)
+    task_ids = queryset.values_list('pk', flat=True)
+    TaskLabel.objects.bulk_create(
+        (TaskLabel(task_id=task_id, label_id=label.pk)
+         for task_id in task_ids.iterator(chunk_size=batch_size)),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    counters.recount_label(label)
+    return task_ids.count()
+
+
+def remove_label(queryset, label, batch_size, actor):
+    events.save(events.label_events(queryset, label, False, actor),
+                batch_size)
+    TaskLabel.objects.filter(label=label, task__in=queryset).delete()
+    counters.recount_label(label)
+    return queryset.count()
+
+
+def delete_rows(model, pks, batch_size):
+    """DELETE ... WHERE pk IN (...) in batches, without the collector."""
+    connection = connections[router.db_for_write(model)]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    deleted = 0
+    with connection.cursor() as cursor:
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(
+                f'DELETE FROM {table} WHERE {column} IN ({placeholders})',
+                batch,
+            )
+            deleted += cursor.rowcount
+    return deleted
+
+
+def delete_tasks(queryset, value, batch_size, actor):
+    # QuerySet.delete() would load every task to send post_delete, and the
+    # signal handlers would count the tasks out a second time. Delete the
+    # TaskLabel rows and the tasks with plain DELETE ... WHERE statements.
+    task_ids = list(queryset.values_list('pk', flat=True))
+    events.save(events.delete_events(queryset, actor), batch_size)
+    counters.remove_tasks(queryset)
+    rollups.remove_tasks(queryset)
+    TaskLabel.objects.filter(task_id__in=task_ids).delete()
+    return delete_rows(Task, task_ids, batch_size)
+
+
+ACTIONS = {
+    'status': set_status,
+    'executor': set_executor,
+    'add_label': add_label,
+    'remove_label': remove_label,
+    'delete': delete_tasks,
+}
+
+
+def apply_bulk_action(queryset, action, value=None, batch_size=1000,
+                      actor=None):
+    """Run a set-based action and return the number of affected tasks.
+
+    No per-object signals are sent, counters, version stamps and the
+    events of ``actor`` are written explicitly.
+    """
+    with transaction.atomic():
+        # The actions change the rows a filtered selection depends on, such
+        # as the labels, resolve it once before the first change.
+        tasks = Task.objects.filter(
+            pk__in=list(queryset.values_list('pk', flat=True))
+        )
+        affected = ACTIONS[action](tasks, value, batch_size, actor)
+        if affected:
+            transaction.on_commit(lambda: ModelVersion.objects.bump(Task))
+    return affected
@@ -0,0 +1,22 @@
+from django.core import checks
+from django.db import models
+
+from task_manager.tasks.bulk import DELETED_RELATIONS
+from task_manager.tasks.models import Task
+
+
+@checks.register(checks.Tags.models)
+def check_bulk_delete_relations(app_configs, **kwargs):
+    """Bulk deletes skip the deletion collector and apply no on_delete."""
+    return [
+        checks.Error(
+            f'{relation.related_model._meta.label} references Task with '
+            f'on_delete other than DO_NOTHING.',
+            hint='Delete its rows in tasks.bulk.delete_tasks() and add it '
+                 'to DELETED_RELATIONS.',
+            id='tasks.E001',
+        )
+        for relation in Task._meta.related_objects
+        if relation.related_model not in DELETED_RELATIONS
+        if relation.on_delete is not models.DO_NOTHING
+    ]
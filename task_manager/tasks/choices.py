@@ -0,0 +1,51 @@
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.forms.models import ModelChoiceIterator
+from django_filters.filters import ModelChoiceFilter
+
+
+def choices_cache_key(model):
+    return f'choices:{model._meta.label_lower}'
+
+
+def get_cached_choices(queryset):
+    """(pk, label) pairs of the whole model table, cached until it changes."""
+    key = choices_cache_key(queryset.model)
+    choices = cache.get(key)
+    if choices is None:
+        choices = [(obj.pk, str(obj)) for obj in queryset.order_by('pk')]
+        cache.set(key, choices, settings.CHOICES_CACHE_TIMEOUT)
+    return choices
+
+
+def invalidate_cached_choices(model):
+    cache.delete(choices_cache_key(model))
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from get_cached_choices(self.queryset)
+
+    def __len__(self):
+        return len(get_cached_choices(self.queryset)) + (
+            1 if self.field.empty_label is not None else 0
+        )
+
+    def __bool__(self):
+        return self.field.empty_label is not None or \
+            bool(get_cached_choices(self.queryset))
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    iterator = CachedModelChoiceIterator
+
+
+class CachedModelMultipleChoiceField(forms.ModelMultipleChoiceField):
+    iterator = CachedModelChoiceIterator
+
+
+class CachedModelChoiceFilter(ModelChoiceFilter):
+    field_class = CachedModelChoiceField
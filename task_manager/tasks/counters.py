@@ -0,0 +1,163 @@
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, \
+    Value
+from django.db.models.functions import Coalesce, Greatest
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskLabel
+from task_manager.users.models import Profile
+from task_manager.versions.models import ModelVersion
+
+# (counter model, counter field, referencing model, referencing field)
+TASK_COUNTERS = (
+    (Status, 'tasks_count', Task, 'status_id'),
+    (Profile, 'created_tasks_count', Task, 'creator_id'),
+    (Profile, 'assigned_tasks_count', Task, 'executor_id'),
+)
+LABEL_COUNTER = (Label, 'tasks_count', TaskLabel, 'label_id')
+COUNTERS = TASK_COUNTERS + (LABEL_COUNTER,)
+
+TASK_COUNTED_FIELDS = tuple(spec[3] for spec in TASK_COUNTERS)
+
+
+def apply_deltas(model, field, deltas):
+    """Add ``deltas`` ({pk: delta}) to ``field``, one UPDATE per delta.
+
+    A drifted counter stops at 0 instead of failing the write, reconcile()
+    fixes it.
+    """
+    pks_by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            pks_by_delta[delta].append(pk)
+    for delta, pks in pks_by_delta.items():
+        updated = model._base_manager.filter(pk__in=pks).update(
+            **{field: Greatest(F(field) + delta, 0)}
+        )
+        if model is Profile and updated < len(pks):
+            create_profiles(pks, field, delta)
+
+
+def create_profiles(user_ids, field, delta):
+    """Create the profiles of users saved raw or loaded from fixtures."""
+    Profile.objects.bulk_create(
+        [Profile(user_id=pk, **{field: max(delta, 0)}) for pk in user_ids],
+        ignore_conflicts=True,
+    )
+
+
+def count_by(queryset, field):
+    rows = queryset.order_by().values(field).annotate(
+        count=Count('pk')
+    ).values_list(field, 'count')
+    return Counter(dict(rows))
+
+
+def task_counted_values(task):
+    return {field: getattr(task, field) for field in TASK_COUNTED_FIELDS}
+
+
+def update_task_counters(old, new):
+    """Move one task between counters, ``old``/``new`` are counted values."""
+    for model, field, _ref_model, ref in TASK_COUNTERS:
+        if old.get(ref) != new.get(ref):
+            apply_deltas(model, field, {old.get(ref): -1, new.get(ref): 1})
+
+
+def update_label_counters(label_ids, sign):
+    apply_deltas(Label, 'tasks_count', {
+        pk: sign * count for pk, count in Counter(label_ids).items()
+    })
+
+
+def add_tasks(tasks, task_labels=()):
+    """Count tasks and label links created in bulk, without queries."""
+    for model, field, _ref_model, ref in TASK_COUNTERS:
+        apply_deltas(model, field, Counter(getattr(task, ref) for task in tasks))
+    update_label_counters((link.label_id for link in task_labels), 1)
+
+
+def remove_tasks(queryset):
+    """Uncount tasks before they are deleted with a set-based DELETE."""
+    for model, field, _ref_model, ref in TASK_COUNTERS:
+        apply_deltas(model, field, {
+            pk: -count for pk, count in count_by(queryset, ref).items()
+        })
+    links = TaskLabel.objects.filter(task__in=queryset)
+    apply_deltas(Label, 'tasks_count', {
+        pk: -count for pk, count in count_by(links, 'label_id').items()
+    })
+
+
+def move_tasks(queryset, ref, new_pk):
+    """Recount tasks whose ``ref`` is about to be set to ``new_pk``."""
+    model, field = next(
+        (model, field) for model, field, _ref_model, counted in TASK_COUNTERS
+        if counted == ref
+    )
+    counts = count_by(queryset, ref)
+    deltas = Counter({pk: -count for pk, count in counts.items()})
+    deltas[new_pk] += sum(counts.values())
+    apply_deltas(model, field, deltas)
+
+
+def recount_label(label):
+    Label.objects.filter(pk=label.pk).update(
+        tasks_count=TaskLabel.objects.filter(label=label).count()
+    )
+
+
+def ensure_profiles(user_ids):
+    Profile.objects.bulk_create(
+        [Profile(user_id=pk) for pk in user_ids], ignore_conflicts=True
+    )
+
+
+def actual_count(ref_model, ref):
+    counts = ref_model._base_manager.filter(
+        **{ref: OuterRef('pk')}
+    ).order_by().values(ref).annotate(count=Count('pk')).values('count')
+    return Coalesce(
+        Subquery(counts, output_field=IntegerField()), Value(0)
+    )
+
+
+def reconcile_counter(model, field, ref_model, ref, dry_run=False):
+    """Fix one counter, return the number of wrong rows."""
+    wrong = model._base_manager.annotate(
+        actual=actual_count(ref_model, ref)
+    ).exclude(**{field: F('actual')}).values_list('pk', 'actual')
+    pks_by_count = defaultdict(list)
+    for pk, actual in wrong.iterator():
+        pks_by_count[actual].append(pk)
+    if not dry_run:
+        for actual, pks in pks_by_count.items():
+            model._base_manager.filter(pk__in=pks).update(**{field: actual})
+    return sum(len(pks) for pks in pks_by_count.values())
+
+
+def reconcile(dry_run=False):
+    """Fix counters that drifted from the tasks tables.
+
+    Returns the number of wrong rows per counter, before fixing them.
+    """
+    missing = get_user_model().objects.filter(profile__isnull=True)
+    drift = {'missing users.Profile': missing.count()}
+    if not dry_run:
+        ensure_profiles(missing.values_list('pk', flat=True).iterator())
+    for model, field, ref_model, ref in COUNTERS:
+        drift[f'{model._meta.label}.{field}'] = reconcile_counter(
+            model, field, ref_model, ref, dry_run
+        )
+    if not dry_run and any(drift.values()):
+        bump_versions()
+    return drift
+
+
+def bump_versions():
+    """update() sends no signals, refresh the pages showing the counters."""
+    for model in (Status, Label, get_user_model(), Task):
+        ModelVersion.objects.bump(model)
@@ -0,0 +1,180 @@
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+
+from task_manager.labels.models import Label
+from task_manager.outbox.models import OutboxMessage
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskEvent, TaskLabel
+
+# Logged fields, relations are stored by primary key.
+FIELDS = ('name', 'status', 'executor')
+
+
+def task_values(task, label_ids=()):
+    return {
+        'name': task.name,
+        'status': task.status_id,
+        'executor': task.executor_id,
+        'labels': sorted(label_ids),
+    }
+
+
+def stored_values(pk):
+    """Values of a saved task, read before a form changes them."""
+    task = Task.objects.only('name', 'status', 'executor').get(pk=pk)
+    label_ids = TaskLabel.objects.filter(task_id=pk).values_list(
+        'label_id', flat=True
+    )
+    return task_values(task, label_ids)
+
+
+def label_changes(before, after):
+    changes = {}
+    added = sorted(set(after) - set(before))
+    removed = sorted(set(before) - set(after))
+    if added:
+        changes['+'] = added
+    if removed:
+        changes['-'] = removed
+    return changes
+
+
+def diff(before, after):
+    changes = {
+        field: [before.get(field), after.get(field)] for field in FIELDS
+        if before.get(field) != after.get(field)
+    }
+    labels = label_changes(before.get('labels', ()), after.get('labels', ()))
+    if labels:
+        changes['labels'] = labels
+    return changes
+
+
+def event(task_id, kind, changes, actor=None):
+    return TaskEvent(task_id=task_id, kind=kind, changes=changes,
+                     actor_id=actor and actor.pk)
+
+
+def created(task, label_ids, actor=None):
+    return event(task.pk, TaskEvent.Kind.CREATED,
+                 diff({}, task_values(task, label_ids)), actor)
+
+
+def updated(task_id, before, after, actor=None):
+    """Event for the change, None if nothing logged changed."""
+    changes = diff(before, after)
+    if changes:
+        return event(task_id, TaskEvent.Kind.UPDATED, changes, actor)
+
+
+def deleted(task, actor=None):
+    return event(task.pk, TaskEvent.Kind.DELETED, {'name': [task.name, None]},
+                 actor)
+
+
+def field_events(queryset, field, value, actor=None):
+    """Events for setting ``field`` to ``value`` on a queryset of tasks."""
+    new = value and value.pk
+    rows = queryset.exclude(**{field: value}).values_list('pk', f'{field}_id')
+    for pk, old in rows.iterator():
+        yield event(pk, TaskEvent.Kind.UPDATED, {field: [old, new]}, actor)
+
+
+def label_events(queryset, label, added, actor=None):
+    linked = TaskLabel.objects.filter(label=label).values('task_id')
+    if added:
+        tasks, changes = queryset.exclude(pk__in=linked), {'+': [label.pk]}
+    else:
+        tasks, changes = queryset.filter(pk__in=linked), {'-': [label.pk]}
+    for pk in tasks.values_list('pk', flat=True).iterator():
+        yield event(pk, TaskEvent.Kind.UPDATED, {'labels': changes}, actor)
+
+
+def delete_events(queryset, actor=None):
+    for pk, name in queryset.values_list('pk', 'name').iterator():
+        yield event(pk, TaskEvent.Kind.DELETED, {'name': [name, None]}, actor)
+
+
+def topic(task_event):
+    if task_event.kind == TaskEvent.Kind.UPDATED \
+            and 'executor' in task_event.changes:
+        return 'task.reassigned'
+    return f'task.{TaskEvent.Kind(task_event.kind).name.lower()}'
+
+
+def webhook_message(task_event):
+    return topic(task_event), {
+        'event': task_event.pk,
+        'task': task_event.task_id,
+        'actor': task_event.actor_id,
+        'changes': task_event.changes,
+        'changed_at': task_event.created_at.isoformat(),
+    }
+
+
+def save(events, batch_size=1000):
+    """Store events and queue their webhooks in the outbox."""
+    events = iter(events)
+    while batch := list(islice(events, batch_size)):
+        OutboxMessage.objects.publish(
+            webhook_message(task_event)
+            for task_event in TaskEvent.objects.bulk_create(batch)
+        )
+
+
+# Models that the primary keys in ``changes`` refer to.
+REFERENCES = {
+    'status': Status,
+    'executor': get_user_model(),
+    'labels': Label,
+}
+
+
+def referenced_ids(events):
+    ids = {field: set() for field in REFERENCES}
+    for task_event in events:
+        for field, change in task_event.changes.items():
+            if field == 'labels':
+                ids[field].update(*change.values())
+            elif field in ids:
+                ids[field].update(pk for pk in change if pk is not None)
+    return ids
+
+
+def describe(events):
+    """Set ``entries`` and ``task_name`` on events for display.
+
+    Entries are (field name, old, new) with names instead of keys, resolved
+    with one query per referenced model for the whole page.
+    """
+    names = {
+        field: {obj.pk: str(obj)
+                for obj in REFERENCES[field]._default_manager.filter(pk__in=ids)}
+        for field, ids in referenced_ids(events).items() if ids
+    }
+    task_names = dict(Task.objects.filter(
+        pk__in={task_event.task_id for task_event in events}
+    ).values_list('pk', 'name'))
+    for task_event in events:
+        task_event.entries = [
+            entry(field, change, names.get(field, {}))
+            for field, change in task_event.changes.items()
+        ]
+        # Deleted tasks are named by the name their events recorded.
+        task_event.task_name = task_names.get(task_event.task_id) or next(
+            filter(None, task_event.changes.get('name', ())), ''
+        )
+    return events
+
+
+def entry(field, change, names):
+    verbose_name = Task._meta.get_field(field).verbose_name
+    if field == 'labels':
+        return (verbose_name,
+                ', '.join(names.get(pk, '') for pk in change.get('-', [])),
+                ', '.join(names.get(pk, '') for pk in change.get('+', [])))
+    if field == 'name':
+        return verbose_name, change[0] or '', change[1] or ''
+    return (verbose_name, names.get(change[0], ''),
+            names.get(change[1], ''))
@@ -0,0 +1,95 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.views import View
+
+from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.tasks.filters import TaskFilterSet
+from task_manager.tasks.models import Task
+
+EXPORT_COLUMNS = ('id', 'name', 'description', 'status', 'creator',
+                  'executor', 'labels', 'created_at')
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def task_row(task):
+    return {
+        'id': task.id,
+        'name': task.name,
+        'description': task.description,
+        'status': task.status.name,
+        'creator': task.creator.username,
+        'executor': task.executor.username if task.executor else None,
+        'labels': [label.name for label in task.labels.all()],
+        'created_at': task.created_at,
+    }
+
+
+CSV_HEADER = csv.writer(Echo()).writerow(EXPORT_COLUMNS)
+
+
+def csv_line(row):
+    row['labels'] = ';'.join(row['labels'])
+    row['created_at'] = row['created_at'].isoformat()
+    return csv.writer(Echo()).writerow(row[column] for column in EXPORT_COLUMNS)
+
+
+def ndjson_line(row):
+    return json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def export_lines(tasks, header, line):
+    if header:
+        yield header
+    for task in tasks:
+        yield line(task_row(task))
+
+
+async def aexport_lines(tasks, header, line):
+    # StreamingHttpResponse buffers a sync iterator under ASGI.
+    if header:
+        yield header
+    async for task in tasks:
+        yield line(task_row(task))
+
+
+class TaskExportView(CustomLoginRequiredMixin, View):
+    """Stream filtered tasks, the (async) iterator keeps one chunk in memory."""
+    formats = {
+        'csv': (CSV_HEADER, csv_line, 'text/csv'),
+        'ndjson': ('', ndjson_line, 'application/x-ndjson'),
+    }
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in self.formats:
+            return HttpResponseBadRequest()
+        filterset = TaskFilterSet(
+            request.GET,
+            queryset=Task.objects.with_relations(),
+            request=request,
+        )
+        if not filterset.is_valid():
+            return HttpResponseBadRequest()
+
+        tasks = filterset.qs.order_by('created_at', 'id')
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        header, line, content_type = self.formats[export_format]
+        if isinstance(request, ASGIRequest):
+            lines = aexport_lines(tasks.aiterator(chunk_size), header, line)
+        else:
+            lines = export_lines(tasks.iterator(chunk_size), header, line)
+        response = StreamingHttpResponse(
+            lines, content_type=f'{content_type}; charset=utf-8',
+        )
+        response.headers['Content-Disposition'] = \
+            f'attachment; filename="tasks.{export_format}"'
+        return response
@@ -1,7 +1,9 @@
+from django.db import models
 from django.forms import CheckboxInput
 from django_filters import FilterSet
-from django_filters.filters import BooleanFilter, ModelChoiceFilter
+from django_filters.filters import BooleanFilter, CharFilter
 from django.utils.translation import gettext as _
+from task_manager.tasks.choices import CachedModelChoiceFilter
 from task_manager.tasks.models import Task
 from task_manager.labels.models import Label
 
@@ -14,17 +16,33 @@ class TaskFilterSet(FilterSet):
         label=_('Only your own tasks'),
     )
 
-    label = ModelChoiceFilter(
+    label = CachedModelChoiceFilter(
         queryset=Label.objects.all(),
         field_name='labels',
         label=_('Label'),
     )
 
+    search = CharFilter(
+        method='filter_search',
+        label=_('Search'),
+    )
+
     def filter_own_tasks(self, queryset, name, value):
         if value:
             return queryset.filter(creator=self.request.user)
         return queryset
 
+    def filter_search(self, queryset, name, value):
+        return queryset.search(value)
+
     class Meta:
         model = Task
         fields = ['status', 'executor', 'label', 'own_tasks']
+        filter_overrides = {
+            models.ForeignKey: {
+                'filter_class': CachedModelChoiceFilter,
+                'extra': lambda field: {
+                    'queryset': field.remote_field.model._default_manager.all(),
+                },
+            },
+        }
@@ -0,0 +1,65 @@
+from django import forms
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+
+from task_manager.tasks.choices import CachedModelChoiceField, \
+    CachedModelMultipleChoiceField
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+
+class TaskForm(forms.ModelForm):
+    class Meta:
+        model = Task
+        fields = ['name', 'description', 'status', 'executor', 'labels']
+        field_classes = {
+            'status': CachedModelChoiceField,
+            'executor': CachedModelChoiceField,
+            'labels': CachedModelMultipleChoiceField,
+        }
+
+
+class TaskBulkActionForm(forms.Form):
+    action = forms.ChoiceField(
+        label=_('Action'),
+        choices=[
+            ('status', _('Change status')),
+            ('executor', _('Change executor')),
+            ('add_label', _('Add label')),
+            ('remove_label', _('Remove label')),
+            ('delete', _('Delete')),
+        ],
+    )
+    status = CachedModelChoiceField(
+        Status.objects.all(), label=_('Status'), required=False
+    )
+    executor = CachedModelChoiceField(
+        get_user_model().objects.all(), label=_('Executor'), required=False
+    )
+    label = CachedModelChoiceField(
+        Label.objects.all(), label=_('Label'), required=False
+    )
+    select_all = forms.BooleanField(
+        label=_('All tasks matching the filter'), required=False
+    )
+
+    VALUE_FIELDS = {
+        'status': 'status',
+        'executor': 'executor',
+        'add_label': 'label',
+        'remove_label': 'label',
+    }
+    REQUIRED_VALUES = ('status', 'label')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        field = self.VALUE_FIELDS.get(cleaned_data.get('action'))
+        if field in self.REQUIRED_VALUES and not cleaned_data.get(field):
+            self.add_error(field, forms.Field.default_error_messages['required'])
+        return cleaned_data
+
+    @property
+    def action_value(self):
+        field = self.VALUE_FIELDS.get(self.cleaned_data['action'])
+        return self.cleaned_data.get(field) if field else None
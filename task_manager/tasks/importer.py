@@ -0,0 +1,226 @@
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, events, rollups
+from task_manager.tasks.choices import invalidate_cached_choices
+from task_manager.tasks.models import Task, TaskLabel
+from task_manager.versions.models import ModelVersion
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+def read_csv(lines):
+    for line_number, row in enumerate(csv.DictReader(lines), start=2):
+        row['labels'] = [
+            name for name in (row.get('labels') or '').split(';') if name
+        ]
+        yield line_number, row
+
+
+def read_ndjson(lines):
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as error:
+            yield line_number, ImportRowError(f'invalid JSON: {error}')
+
+
+READERS = {'csv': read_csv, 'ndjson': read_ndjson}
+
+
+def max_length(model, field):
+    return model._meta.get_field(field).max_length
+
+
+def text(value, field, limit=None):
+    """A stripped string value, ``''`` when missing."""
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise ImportRowError(f'{field} must be a string')
+    value = value.strip()
+    if limit and len(value) > limit:
+        raise ImportRowError(f'{field} is longer than {limit} characters')
+    return value
+
+
+def parse_created_at(value):
+    value = text(value, 'created_at')
+    if not value:
+        return timezone.now()
+    try:
+        created_at = parse_datetime(value)
+    except ValueError:
+        created_at = None
+    if created_at is None:
+        raise ImportRowError('invalid created_at')
+    if timezone.is_naive(created_at):
+        created_at = timezone.make_aware(created_at)
+    return created_at
+
+
+class NameMap:
+    """In-memory name -> pk lookup that creates missing rows in bulk."""
+
+    def __init__(self, model, field, defaults=None):
+        self.model = model
+        self.field = field
+        self.defaults = defaults or {}
+        self.pks = dict(
+            model.objects.values_list(field, 'pk').iterator()
+        )
+        self.created = 0
+
+    def ensure(self, names):
+        missing = sorted({name for name in names if name not in self.pks})
+        if not missing:
+            return []
+        created = self.model.objects.bulk_create([
+            self.model(**{self.field: name}, **self.defaults)
+            for name in missing
+        ])
+        self.pks.update((getattr(obj, self.field), obj.pk) for obj in created)
+        self.created += len(created)
+        return created
+
+    def __getitem__(self, name):
+        return self.pks[name]
+
+
+class TaskImporter:
+    def __init__(self, batch_size=1000, on_error=None):
+        self.batch_size = batch_size
+        self.on_error = on_error or (lambda line, message: None)
+        self.statuses = NameMap(Status, 'name')
+        self.labels = NameMap(Label, 'name')
+        self.users = NameMap(get_user_model(), 'username',
+                             {'password': '!'})
+        self.imported = 0
+        self.failed = 0
+        username_length = max_length(get_user_model(), 'username')
+        self.max_lengths = {
+            'name': max_length(Task, 'name'),
+            'status': max_length(Status, 'name'),
+            'creator': username_length,
+            'executor': username_length,
+        }
+        self.label_length = max_length(Label, 'name')
+
+    def parse_labels(self, labels):
+        if labels is None:
+            return []
+        if not isinstance(labels, list):
+            raise ImportRowError('labels must be a list of strings')
+        labels = [text(label, 'labels', self.label_length)
+                  for label in labels]
+        return [label for label in labels if label]
+
+    def parse(self, row):
+        if isinstance(row, Exception):
+            raise row
+        if not isinstance(row, dict):
+            raise ImportRowError('row must be an object')
+        data = {
+            field: text(row.get(field), field, limit)
+            for field, limit in self.max_lengths.items()
+        }
+        if not (data['name'] and data['status'] and data['creator']):
+            raise ImportRowError('name, status and creator are required')
+        return {
+            **data,
+            'description': text(row.get('description'), 'description'),
+            'executor': data['executor'] or None,
+            'labels': self.parse_labels(row.get('labels')),
+            'created_at': parse_created_at(row.get('created_at')),
+        }
+
+    def error(self, line_number, message):
+        self.failed += 1
+        self.on_error(line_number, str(message))
+
+    def parse_batch(self, batch):
+        parsed = {}
+        for line_number, row in batch:
+            try:
+                data = self.parse(row)
+            except ImportRowError as error:
+                self.error(line_number, error)
+                continue
+            if data['name'] in parsed:
+                self.error(line_number, f'duplicate name "{data["name"]}"')
+                continue
+            parsed[data['name']] = (line_number, data)
+
+        existing = Task.objects.filter(name__in=parsed).values_list(
+            'name', flat=True
+        )
+        for name in existing:
+            line_number, _data = parsed.pop(name)
+            self.error(line_number, f'task "{name}" already exists')
+        return [data for _line_number, data in parsed.values()]
+
+    def insert_batch(self, rows):
+        self.statuses.ensure(row['status'] for row in rows)
+        self.labels.ensure(name for row in rows for name in row['labels'])
+        users = self.users.ensure(
+            name for row in rows
+            for name in (row['creator'], row['executor']) if name
+        )
+        counters.ensure_profiles(user.pk for user in users)
+        tasks = Task.objects.bulk_create([
+            Task(
+                name=row['name'],
+                description=row['description'],
+                status_id=self.statuses[row['status']],
+                creator_id=self.users[row['creator']],
+                executor_id=row['executor'] and self.users[row['executor']],
+                created_at=row['created_at'],
+            )
+            for row in rows
+        ])
+        task_labels = TaskLabel.objects.bulk_create([
+            TaskLabel(task_id=task.pk, label_id=self.labels[name])
+            for task, row in zip(tasks, rows)
+            for name in dict.fromkeys(row['labels'])
+        ], batch_size=self.batch_size)
+        counters.add_tasks(tasks, task_labels)
+        rollups.add_tasks(tasks)
+        label_ids = defaultdict(list)
+        for link in task_labels:
+            label_ids[link.task_id].append(link.label_id)
+        events.save(
+            (events.created(task, label_ids[task.pk]) for task in tasks),
+            self.batch_size,
+        )
+        self.imported += len(tasks)
+
+    def run(self, rows):
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            parsed = self.parse_batch(batch)
+            if parsed:
+                with transaction.atomic():
+                    self.insert_batch(parsed)
+            yield self.imported, self.failed
+
+    def finish(self):
+        """bulk_create sends no signals, refresh caches and versions here."""
+        for name_map in (self.statuses, self.labels, self.users):
+            if name_map.created:
+                invalidate_cached_choices(name_map.model)
+                ModelVersion.objects.bump(name_map.model)
+        if self.imported:
+            ModelVersion.objects.bump(Task)
@@ -0,0 +1,47 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+
+class Command(BaseCommand):
+    help = ('Measure the per-request cost of getting a database connection, '
+            'with the connection handling of the current settings.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        connection.close()
+        connect_times, request_times = [], []
+        for _ in range(options['requests']):
+            # The same hooks Django runs on request_started/request_finished.
+            close_old_connections()
+            started = time.perf_counter()
+            connection.ensure_connection()
+            connected = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            close_old_connections()
+            connect_times.append(connected - started)
+            request_times.append(time.perf_counter() - started)
+
+        engine = connection.settings_dict['ENGINE']
+        self.stdout.write(
+            f'{engine}, CONN_MAX_AGE={connection.settings_dict["CONN_MAX_AGE"]}'
+        )
+        self.report('connect', connect_times)
+        self.report('connect + SELECT 1', request_times)
+        if hasattr(connection, 'pool_wait'):
+            self.stdout.write(f'pool: {connection.pool.stats()}')
+
+    def report(self, label, timings):
+        timings = sorted(timing * 1000 for timing in timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f'{label}: mean {statistics.mean(timings):.3f} ms, '
+            f'median {statistics.median(timings):.3f} ms, p95 {p95:.3f} ms'
+        )
@@ -0,0 +1,191 @@
+import json
+import logging
+import statistics
+import time
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.management.commands.seed_benchmark import \
+    BENCHMARK_PASSWORD
+from task_manager.tasks.models import Task
+
+SKIPPED_NAMESPACES = ('admin',)
+
+
+def iter_url_patterns(resolver, prefix=''):
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in SKIPPED_NAMESPACES:
+                continue
+            yield from iter_url_patterns(
+                pattern, prefix + str(pattern.pattern)
+            )
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield prefix + str(pattern.pattern), pattern
+
+
+class Command(BaseCommand):
+    help = ('Time every URL through the test client and record query '
+            'count, wall time and response size.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--output', help='Write results to a JSON file.')
+        parser.add_argument('--baseline',
+                            help='Compare results with a JSON baseline.')
+        parser.add_argument('--no-fragment-cache', action='store_true',
+                            help='Render without cached template fragments.')
+
+    def get_objects(self):
+        task = Task.objects.order_by('pk').first()
+        if task is None:
+            raise CommandError('No tasks found, run seed_benchmark first.')
+        user = task.creator
+        return user, {
+            'tasks': task,
+            'statuses': Status.objects.order_by('pk').first(),
+            'labels': Label.objects.order_by('pk').first(),
+            'users': user,
+        }
+
+    def get_post_data(self, name, objects):
+        task = objects['tasks']
+        return {
+            'login': {'username': objects['users'].username,
+                      'password': BENCHMARK_PASSWORD},
+            'user_create': {'username': 'benchmark_user',
+                            'password1': BENCHMARK_PASSWORD,
+                            'password2': BENCHMARK_PASSWORD},
+            'user_update': {'username': objects['users'].username,
+                            'password1': BENCHMARK_PASSWORD,
+                            'password2': BENCHMARK_PASSWORD},
+            'status_create': {'name': 'Benchmark status'},
+            'status_update': {'name': 'Benchmark status'},
+            'label_create': {'name': 'Benchmark label'},
+            'label_update': {'name': 'Benchmark label'},
+            'task_create': {'name': 'Benchmark task',
+                            'status': task.status_id,
+                            'labels': [objects['labels'].pk]},
+            'task_update': {'name': task.name, 'status': task.status_id,
+                            'labels': [objects['labels'].pk]},
+        }.get(name, {})
+
+    def get_cases(self, objects):
+        for route, pattern in iter_url_patterns(get_resolver()):
+            path = '/' + route.replace('<int:pk>', '{pk}')
+            app = route.split('/')[0]
+            if '{pk}' in path:
+                path = path.format(pk=objects[app].pk)
+            if pattern.name != 'logout':
+                yield f'GET {pattern.name}', 'get', path, None
+            if pattern.name in ('logout', 'login') or \
+                    pattern.name.endswith(('_create', '_update', '_delete')):
+                data = self.get_post_data(pattern.name, objects)
+                yield f'POST {pattern.name}', 'post', path, data
+
+    def measure(self, client, user, method, path, data):
+        # The rollback below also drops the session row, while the cached
+        # session would survive it: start every run with a new session and
+        # warm the session and user caches as a logged in user would.
+        client.cookies.clear()
+        with transaction.atomic():
+            client.force_login(user)
+            client.get(reverse('index'))
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = getattr(client, method)(path, data)
+                content = response.getvalue()
+                elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        return {
+            'status': response.status_code,
+            'queries': len(queries),
+            'time_ms': elapsed * 1000,
+            'render_ms': response.wsgi_request._render_time * 1000,
+            'bytes': len(content),
+        }
+
+    def run_case(self, client, user, method, path, data, repeat):
+        runs = [self.measure(client, user, method, path, data)
+                for _ in range(repeat)]
+        return {
+            'path': path,
+            'status': runs[-1]['status'],
+            'queries': runs[-1]['queries'],
+            'bytes': runs[-1]['bytes'],
+            'time_ms': round(statistics.median(
+                run['time_ms'] for run in runs), 3),
+            'render_ms': round(statistics.median(
+                run['render_ms'] for run in runs), 3),
+        }
+
+    def compare(self, results, baseline_path):
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        for name, result in results.items():
+            old = baseline.get(name)
+            if old is None:
+                continue
+            self.stdout.write(
+                f'{name}: queries {old["queries"]} -> {result["queries"]}, '
+                f'time {old["time_ms"]:.1f} -> {result["time_ms"]:.1f} ms, '
+                f'render {old.get("render_ms", 0):.1f} -> '
+                f'{result["render_ms"]:.1f} ms, '
+                f'bytes {old["bytes"]} -> {result["bytes"]}'
+            )
+
+    def get_settings(self, options):
+        # The instrumentation middleware measures render time per request.
+        overrides = {
+            'REQUEST_INSTRUMENTATION': True,
+            'REQUEST_INSTRUMENTATION_SAMPLE_RATE': 1.0,
+        }
+        if options['no_fragment_cache']:
+            overrides['CACHES'] = {**settings.CACHES, 'fragments': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+            }}
+        return override_settings(**overrides)
+
+    def run_cases(self, objects, user, repeat):
+        client = Client(SERVER_NAME='localhost')
+        results = {}
+        for name, method, path, data in self.get_cases(objects):
+            results[name] = self.run_case(
+                client, user, method, path, data, repeat
+            )
+            self.stdout.write(f'{name}: {results[name]}')
+        return results
+
+    def handle(self, *args, **options):
+        user, objects = self.get_objects()
+        logging.getLogger('task_manager.performance').setLevel(logging.WARNING)
+        with self.get_settings(options):
+            results = self.run_cases(objects, user, options['repeat'])
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'repeat': options['repeat'],
+                'fragment_cache': not options['no_fragment_cache'],
+                'tasks': Task.objects.count(),
+                'users': get_user_model().objects.count(),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(report, output_file, indent=2, sort_keys=True)
+        if options['baseline']:
+            self.compare(results, options['baseline'])
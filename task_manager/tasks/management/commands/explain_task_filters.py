@@ -0,0 +1,88 @@
+import re
+from itertools import product
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.filters import TaskFilterSet
+from task_manager.tasks.models import Task
+
+FULL_SCAN_PATTERNS = (
+    re.compile(r'\bSCAN tasks_task\b(?! USING)'),
+    re.compile(r'Seq Scan on tasks_task\b'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN for every TaskFilterSet filter combination.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Fail if any plan runs a full scan of the tasks tables.',
+        )
+
+    def get_filter_values(self):
+        user = get_user_model().objects.order_by('pk').first()
+        status = Status.objects.order_by('pk').first()
+        label = Label.objects.order_by('pk').first()
+        if not (user and status and label):
+            raise CommandError(
+                'At least one user, status and label are required.'
+            )
+        return user, {
+            'status': status.pk,
+            'executor': user.pk,
+            'label': label.pk,
+            'own_tasks': 'on',
+            'search': 'task',
+        }
+
+    def get_combinations(self, values):
+        for enabled in product((False, True), repeat=len(values)):
+            yield {
+                name: value
+                for (name, value), on in zip(values.items(), enabled) if on
+            }
+
+    def explain(self, user, data):
+        filterset = TaskFilterSet(
+            data=data,
+            queryset=Task.objects.for_list(),
+            request=SimpleNamespace(user=user),
+        )
+        queryset = filterset.qs.order_by('created_at', 'id')
+        return queryset[:settings.PAGINATION_PAGE_SIZE + 1].explain()
+
+    def handle(self, *args, **options):
+        user, values = self.get_filter_values()
+        with transaction.atomic(using=Task.objects.db):
+            regressions = self.explain_combinations(user, values)
+
+        if regressions and options['check']:
+            raise CommandError(
+                'Full table scan in: ' + '; '.join(regressions)
+            )
+
+    def explain_combinations(self, user, values):
+        connection = connections[Task.objects.db]
+        if connection.vendor == 'postgresql':
+            # The planner prefers a Seq Scan on a small table. With seq
+            # scans disabled a Seq Scan is left only where no index fits.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        regressions = []
+        for data in self.get_combinations(values):
+            name = ', '.join(data) or 'no filters'
+            plan = self.explain(user, data)
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            if any(pattern.search(plan) for pattern in FULL_SCAN_PATTERNS):
+                regressions.append(name)
+        return regressions
@@ -0,0 +1,71 @@
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.tasks.importer import READERS, TaskImporter
+
+
+class DryRunRollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Bulk import tasks from CSV or NDJSON, creating missing '
+            'statuses, labels and users by name.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input file, "-" for stdin.')
+        parser.add_argument('--format', choices=sorted(READERS))
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate and insert, then roll back.')
+
+    def get_format(self, options):
+        if options['format']:
+            return options['format']
+        for name in READERS:
+            if options['path'].endswith(f'.{name}'):
+                return name
+        raise CommandError('Unable to detect the format, use --format.')
+
+    def report_error(self, line_number, message):
+        self.stderr.write(f'line {line_number}: {message}')
+
+    def import_rows(self, importer, rows):
+        started = time.perf_counter()
+        for imported, failed in importer.run(rows):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'imported {imported}, failed {failed}, '
+                f'{(imported + failed) / elapsed:.0f} rows/s'
+            )
+        importer.finish()
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        reader = READERS[self.get_format(options)]
+        importer = TaskImporter(options['batch_size'], self.report_error)
+        source = sys.stdin if options['path'] == '-' else \
+            open(options['path'], newline='', encoding='utf-8')
+        # Batches commit one by one, a dry run wraps them in a single
+        # transaction that is rolled back at the end.
+        outer = transaction.atomic() if options['dry_run'] else nullcontext()
+        try:
+            with outer:
+                elapsed = self.import_rows(importer, reader(source))
+                if options['dry_run']:
+                    raise DryRunRollback
+        except DryRunRollback:
+            self.stdout.write(self.style.WARNING('Dry run, rolled back.'))
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        total = importer.imported + importer.failed
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {importer.imported} imported, {importer.failed} failed, '
+            f'{total / elapsed if elapsed else total:.0f} rows/s'
+        ))
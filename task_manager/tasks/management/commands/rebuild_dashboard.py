@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.tasks import counters, rollups
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the dashboard rollups and counters from the tasks '
+            'tables.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only compare them with the tasks, fail if any drifted.',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rolled_up, actual = rollups.check()
+            drift = counters.reconcile(dry_run=options['check'])
+            if not options['check']:
+                rollups.rebuild()
+        for counter, wrong in drift.items():
+            self.stdout.write(f'{counter}: {wrong} wrong')
+        self.stdout.write(
+            f'Open/closed tasks: {rolled_up} rolled up, {actual} actual'
+        )
+
+        total = sum(drift.values()) + (rolled_up != actual)
+        if total and options['check']:
+            raise CommandError(f'{total} counters drifted.')
+        self.stdout.write(self.style.SUCCESS(
+            'Rebuilt the dashboard.' if not options['check']
+            else 'The dashboard matches the tasks.'
+        ))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.tasks import counters
+
+
+class Command(BaseCommand):
+    help = ('Recount the task counters of statuses, labels and users and '
+            'fix the rows that drifted.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drift, fail if any counter is wrong.',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drift = counters.reconcile(dry_run=options['check'])
+        for counter, wrong in drift.items():
+            self.stdout.write(f'{counter}: {wrong} wrong')
+
+        total = sum(drift.values())
+        if total and options['check']:
+            raise CommandError(f'{total} counters drifted.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Fixed {total} counters.' if total else 'All counters match.'
+        ))
@@ -0,0 +1,115 @@
+import random
+import secrets
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, rollups
+from task_manager.tasks.choices import invalidate_cached_choices
+from task_manager.tasks.models import Task, TaskLabel
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+# Most tasks carry one or two labels, a few carry many.
+LABEL_FAN_OUT_WEIGHTS = (15, 35, 25, 12, 8, 5)
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create users, statuses, labels and tasks for benchmarks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--statuses', type=int, default=10)
+        parser.add_argument('--labels', type=int, default=30)
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def bulk_create(self, model, objects, batch_size):
+        return model.objects.bulk_create(objects, batch_size=batch_size)
+
+    def create_users(self, prefix, count, batch_size):
+        password = make_password(BENCHMARK_PASSWORD)
+        return self.bulk_create(get_user_model(), [
+            get_user_model()(
+                username=f'{prefix}-user-{number}',
+                first_name='Bench',
+                last_name=f'User {number}',
+                password=password,
+            )
+            for number in range(count)
+        ], batch_size)
+
+    def create_named(self, model, prefix, count, batch_size):
+        return self.bulk_create(model, [
+            model(name=f'{prefix}-{model._meta.model_name}-{number}')
+            for number in range(count)
+        ], batch_size)
+
+    def build_tasks(self, prefix, start, stop, refs):
+        now = timezone.now()
+        for number in range(start, stop):
+            executor = self.rng.choice(refs['users'])
+            yield Task(
+                name=f'{prefix}-task-{number}',
+                description=f'Benchmark task number {number}',
+                status=self.rng.choice(refs['statuses']),
+                creator=self.rng.choice(refs['users']),
+                executor=executor if self.rng.random() > 0.2 else None,
+                created_at=now - timedelta(
+                    minutes=self.rng.randrange(60 * 24 * 365)
+                ),
+            )
+
+    def build_task_labels(self, tasks, labels):
+        fan_out = range(len(LABEL_FAN_OUT_WEIGHTS))
+        for task in tasks:
+            count = self.rng.choices(fan_out, LABEL_FAN_OUT_WEIGHTS)[0]
+            for label in self.rng.sample(labels, min(count, len(labels))):
+                yield TaskLabel(task_id=task.pk, label_id=label.pk)
+
+    def create_tasks(self, prefix, count, batch_size, refs):
+        for start in range(0, count, batch_size):
+            stop = min(start + batch_size, count)
+            with transaction.atomic():
+                tasks = self.bulk_create(
+                    Task, list(self.build_tasks(prefix, start, stop, refs)),
+                    batch_size,
+                )
+                task_labels = self.bulk_create(
+                    TaskLabel,
+                    list(self.build_task_labels(tasks, refs['labels'])),
+                    batch_size,
+                )
+                counters.add_tasks(tasks, task_labels)
+                rollups.add_tasks(tasks)
+            self.stdout.write(f'Tasks: {stop}/{count}')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        prefix = f'bench-{secrets.token_hex(3)}'
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            refs = {
+                'users': self.create_users(
+                    prefix, options['users'], batch_size),
+                'statuses': self.create_named(
+                    Status, prefix, options['statuses'], batch_size),
+                'labels': self.create_named(
+                    Label, prefix, options['labels'], batch_size),
+            }
+            counters.ensure_profiles(user.pk for user in refs['users'])
+        # bulk_create does not send post_save, drop cached choices by hand.
+        for model in (get_user_model(), Status, Label):
+            invalidate_cached_choices(model)
+        self.create_tasks(prefix, options['tasks'], batch_size, refs)
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded "{prefix}" data, users log in with '
+            f'password "{BENCHMARK_PASSWORD}"'
+        ))
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-18 04:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0001_initial'),
+        ('statuses', '0001_initial'),
+        ('tasks', '0002_task_labels'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'executor', 'created_at', 'id'], name='task_status_executor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['creator', 'created_at', 'id'], name='task_creator_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('executor__isnull', False)), fields=['executor', 'created_at', 'id'], name='task_assigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('executor__isnull', True)), fields=['status', 'created_at', 'id'], name='task_unassigned_idx'),
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX task_labels_label_task_idx '
+                'ON tasks_task_labels (label_id, task_id);',
+            reverse_sql='DROP INDEX task_labels_label_task_idx;',
+        ),
+    ]
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE tasks_task ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED;
+    """,
+    'CREATE INDEX task_search_idx ON tasks_task USING GIN (search_vector);',
+]
+POSTGRES_BACKWARD = [
+    'DROP INDEX task_search_idx;',
+    'ALTER TABLE tasks_task DROP COLUMN search_vector;',
+]
+
+# External content FTS5 table kept in sync by triggers. A migration that
+# remakes tasks_task on SQLite drops the triggers and has to recreate them.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE tasks_task_fts USING fts5(
+        name, description, content='tasks_task', content_rowid='id'
+    );
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts (tasks_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_update
+    AFTER UPDATE OF name, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts (tasks_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO tasks_task_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END;
+    """,
+    "INSERT INTO tasks_task_fts (tasks_task_fts) VALUES ('rebuild');",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER tasks_task_fts_update;',
+    'DROP TRIGGER tasks_task_fts_delete;',
+    'DROP TRIGGER tasks_task_fts_insert;',
+    'DROP TABLE tasks_task_fts;',
+]
+
+STATEMENTS = {
+    'postgresql': (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+    'sqlite': (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def run_statements(direction):
+    def run(apps, schema_editor):
+        statements = STATEMENTS.get(schema_editor.connection.vendor)
+        for sql in (statements[direction] if statements else []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_statements(0), run_statements(1)),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.14 on 2026-10-18 04:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0001_initial'),
+        ('tasks', '0004_task_search'),
+    ]
+
+    # The table already exists as the auto-created M2M table, only the
+    # state changes: the explicit model makes the label FK PROTECT.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TaskLabel',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('label', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='labels.label')),
+                        ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tasks.task')),
+                    ],
+                    options={
+                        'db_table': 'tasks_task_labels',
+                        'unique_together': {('task', 'label')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='task',
+                    name='labels',
+                    field=models.ManyToManyField(blank=True, related_name='tasks', through='tasks.TaskLabel', to='labels.label', verbose_name='labels'),
+                ),
+            ],
+        ),
+    ]
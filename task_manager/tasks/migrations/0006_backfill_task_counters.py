@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_of(model, field):
+    counts = model.objects.filter(**{field: OuterRef('pk')}).order_by() \
+        .values(field).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskLabel = apps.get_model('tasks', 'TaskLabel')
+    Profile = apps.get_model('users', 'Profile')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    Profile.objects.bulk_create(
+        [Profile(user_id=pk) for pk in User.objects.values_list('pk', flat=True)],
+        ignore_conflicts=True,
+    )
+    apps.get_model('statuses', 'Status').objects.update(
+        tasks_count=count_of(Task, 'status_id')
+    )
+    apps.get_model('labels', 'Label').objects.update(
+        tasks_count=count_of(TaskLabel, 'label_id')
+    )
+    Profile.objects.update(
+        created_tasks_count=count_of(Task, 'creator_id'),
+        assigned_tasks_count=count_of(Task, 'executor_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_label_tasks_count'),
+        ('statuses', '0002_status_tasks_count'),
+        ('tasks', '0005_task_labels_through'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-18 05:43
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_backfill_task_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'created'), (2, 'updated'), (3, 'deleted')], verbose_name='kind')),
+                ('changes', models.JSONField(verbose_name='changes')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='changed datetime')),
+                ('actor', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='author of the change')),
+                ('task', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='events', to='tasks.task', verbose_name='task')),
+            ],
+            options={
+                'verbose_name': 'Task event',
+                'verbose_name_plural': 'Task events',
+                'indexes': [models.Index(fields=['task', 'id'], name='task_event_timeline_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-18 05:50
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill(apps, schema_editor):
+    # No status is closed yet, every task opened on its creation day.
+    Task = apps.get_model('tasks', 'Task')
+    TaskRollup = apps.get_model('tasks', 'TaskRollup')
+    days = Task.objects.annotate(day=TruncDate('created_at')).order_by() \
+        .values('day').annotate(count=Count('pk')).values_list('day', 'count')
+    TaskRollup.objects.bulk_create(
+        TaskRollup(day=day, opened=count)
+        for day, count in days
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0003_status_is_closed'),
+        ('tasks', '0007_task_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True, verbose_name='day')),
+                ('opened', models.IntegerField(default=0, verbose_name='open tasks change')),
+                ('closed', models.IntegerField(default=0, verbose_name='closed tasks change')),
+            ],
+            options={
+                'verbose_name': 'Daily task rollup',
+                'verbose_name_plural': 'Daily task rollups',
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.14 on 2026-10-18 06:30
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+task_search = import_module('task_manager.tasks.migrations.0004_task_search')
+
+TRIGGERS = ('tasks_task_fts_insert', 'tasks_task_fts_delete',
+            'tasks_task_fts_update')
+
+
+def create_search_triggers(apps, schema_editor):
+    # Adding or removing the column remakes tasks_task on SQLite, which
+    # drops the full-text search triggers.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for trigger in TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger};')
+    for sql in task_search.SQLITE_FORWARD:
+        if 'CREATE TRIGGER' in sql:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop,
+                             create_search_triggers),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='updated datetime'),
+        ),
+        migrations.RunPython(create_search_triggers,
+                             migrations.RunPython.noop),
+    ]
@@ -1,5 +1,10 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVectorExact, SearchVectorField,
+)
+from django.db import connections, models, transaction
+from django.db.models.expressions import Col, RawSQL
+from django.db.models.functions import Cast
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -7,6 +12,89 @@ from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 
 
+class SearchVectorColumn(models.Expression):
+    """The generated ``search_vector`` column of migration 0004.
+
+    It is not a model field, so the column is resolved against the alias
+    of the task table in the query it is used in.
+    """
+
+    field = SearchVectorField()
+    field.set_attributes_from_name('search_vector')
+
+    def resolve_expression(self, query=None, *args, **kwargs):
+        return Col(query.get_initial_alias(), self.field)
+
+
+class FTS5Rank(models.Func):
+    """``-bm25()`` of a task in the FTS5 table for a MATCH query.
+
+    Takes the query and the task id, the joiner puts the id in the WHERE
+    clause of the correlated subquery.
+    """
+
+    template = (
+        '(SELECT -bm25(tasks_task_fts) FROM tasks_task_fts '
+        'WHERE tasks_task_fts MATCH %(expressions)s)'
+    )
+    arg_joiner = ' AND tasks_task_fts.rowid = '
+    output_field = models.FloatField()
+
+
+class TaskQuerySet(models.QuerySet):
+    LIST_FIELDS = (
+        'id', 'name', 'created_at', 'updated_at',
+        'status__name',
+        'creator__first_name', 'creator__last_name',
+        'executor__first_name', 'executor__last_name',
+    )
+
+    def with_relations(self):
+        return self.select_related(
+            'status', 'creator', 'executor'
+        ).prefetch_related(
+            models.Prefetch('labels', queryset=Label.objects.only('name'))
+        )
+
+    def for_list(self):
+        return self.with_relations().only(
+            *self.LIST_FIELDS
+        ).order_by('created_at', 'id')
+
+    def for_detail(self):
+        return self.with_relations()
+
+    def search(self, query):
+        """Filter by full-text match and annotate a ``search_rank``.
+
+        Uses the generated tsvector column on PostgreSQL and the FTS5
+        table on SQLite, both created in migration 0004.
+        """
+        vendor = connections[self.db].vendor
+        if vendor == 'postgresql':
+            vector = SearchVectorColumn()
+            query = SearchQuery(query, config='simple', search_type='websearch')
+            match = SearchVectorExact(vector, query)
+            # ts_rank returns a real, which the cursor would compare as a
+            # double and skip or repeat rows with the same rank.
+            rank = Cast(SearchRank(vector, query), models.FloatField())
+        elif vendor == 'sqlite':
+            query = ' '.join(
+                '"{}"'.format(term.replace('"', '""'))
+                for term in query.split()
+            )
+            match = models.Q(pk__in=RawSQL(
+                'SELECT rowid FROM tasks_task_fts '
+                'WHERE tasks_task_fts MATCH %s', [query],
+            ))
+            rank = FTS5Rank(models.Value(query), 'pk')
+        else:
+            match = models.Q(name__icontains=query) | \
+                models.Q(description__icontains=query)
+            rank = models.Value(0.0, output_field=models.FloatField())
+        return self.filter(match).annotate(search_rank=rank)
+
+
 class Task(models.Model):
     name = models.CharField(_('name'), max_length=256, unique=True)
     description = models.TextField(_('description'), blank=True)
@@ -32,6 +120,7 @@ class Task(models.Model):
     )
     labels = models.ManyToManyField(
         Label,
+        through='TaskLabel',
         related_name='tasks',
         blank=True,
         verbose_name=_('labels'),
@@ -39,10 +128,114 @@ class Task(models.Model):
     created_at = models.DateTimeField(
         _('created datetime'), default=timezone.now
     )
+    # Set by save(), bulk updates set it explicitly.
+    updated_at = models.DateTimeField(_('updated datetime'), auto_now=True)
+
+    objects = TaskQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Counter columns are updated by save signals, keep them together.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _('Task')
         verbose_name_plural = _('Tasks')
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'], name='task_created_idx'
+            ),
+            models.Index(
+                fields=['status', 'executor', 'created_at', 'id'],
+                name='task_status_executor_idx',
+            ),
+            models.Index(
+                fields=['creator', 'created_at', 'id'],
+                name='task_creator_created_idx',
+            ),
+            models.Index(
+                fields=['executor', 'created_at', 'id'],
+                condition=models.Q(executor__isnull=False),
+                name='task_assigned_idx',
+            ),
+            models.Index(
+                fields=['status', 'created_at', 'id'],
+                condition=models.Q(executor__isnull=True),
+                name='task_unassigned_idx',
+            ),
+        ]
+
+
+class TaskLabel(models.Model):
+    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    label = models.ForeignKey(Label, on_delete=models.PROTECT)
+
+    class Meta:
+        db_table = 'tasks_task_labels'
+        unique_together = [('task', 'label')]
+
+
+class TaskEvent(models.Model):
+    """Append-only record of one change to a task.
+
+    ``changes`` holds only the changed fields as ``{field: [old, new]}``
+    with primary keys for relations, and labels as ``{"+": [...], "-":
+    [...]}``. Events outlive the task and the user, so neither relation
+    has a database constraint.
+    """
+
+    class Kind(models.IntegerChoices):
+        CREATED = 1, _('created')
+        UPDATED = 2, _('updated')
+        DELETED = 3, _('deleted')
+
+    id = models.BigAutoField(primary_key=True)
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='events',
+        verbose_name=_('task'),
+    )
+    actor = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name='+',
+        verbose_name=_('author of the change'),
+    )
+    kind = models.PositiveSmallIntegerField(_('kind'), choices=Kind.choices)
+    changes = models.JSONField(_('changes'))
+    created_at = models.DateTimeField(
+        _('changed datetime'), default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = _('Task event')
+        verbose_name_plural = _('Task events')
+        indexes = [
+            # Per-task timeline, newest first. The global feed walks the
+            # primary key.
+            models.Index(fields=['task', 'id'], name='task_event_timeline_idx'),
+        ]
+
+
+class TaskRollup(models.Model):
+    """Net change of open and closed tasks per day.
+
+    Maintained by task_manager.tasks.rollups, summing every row gives the
+    current totals and walking back from them gives the daily trend.
+    """
+    day = models.DateField(_('day'), unique=True)
+    opened = models.IntegerField(_('open tasks change'), default=0)
+    closed = models.IntegerField(_('closed tasks change'), default=0)
+
+    class Meta:
+        verbose_name = _('Daily task rollup')
+        verbose_name_plural = _('Daily task rollups')
@@ -0,0 +1,174 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskRollup
+
+# TaskRollup field by Status.is_closed.
+FIELDS = {False: 'opened', True: 'closed'}
+
+
+def record(deltas, day=None):
+    """Add ``deltas`` ({is_closed: delta}) to the rollup of ``day``."""
+    changes = {
+        FIELDS[closed]: F(FIELDS[closed]) + delta
+        for closed, delta in deltas.items() if delta
+    }
+    if not changes:
+        return
+    day = day or timezone.localdate()
+    TaskRollup.objects.bulk_create(
+        [TaskRollup(day=day)], ignore_conflicts=True
+    )
+    TaskRollup.objects.filter(day=day).update(**changes)
+
+
+def closed_flags(status_ids):
+    return dict(Status.objects.filter(
+        pk__in={pk for pk in status_ids if pk is not None}
+    ).values_list('pk', 'is_closed'))
+
+
+def move_task(old_status_id, new_status_id):
+    """Roll up one task changing status, ``None`` when created/deleted."""
+    if old_status_id == new_status_id:
+        return
+    flags = closed_flags([old_status_id, new_status_id])
+    deltas = Counter()
+    deltas[flags.get(old_status_id)] -= 1
+    deltas[flags.get(new_status_id)] += 1
+    deltas.pop(None, None)
+    record(deltas)
+
+
+def count_closed(queryset):
+    rows = queryset.order_by().values('status__is_closed').annotate(
+        count=Count('pk')
+    ).values_list('status__is_closed', 'count')
+    return Counter(dict(rows))
+
+
+def add_tasks(tasks):
+    """Roll up tasks created in bulk on the days they were created."""
+    flags = closed_flags(task.status_id for task in tasks)
+    by_day = defaultdict(Counter)
+    for task in tasks:
+        day = timezone.localdate(task.created_at)
+        by_day[day][flags[task.status_id]] += 1
+    for day, deltas in by_day.items():
+        record(deltas, day)
+
+
+def move_tasks(queryset, status):
+    """Roll up tasks whose status is about to be set to ``status``."""
+    counts = count_closed(queryset)
+    deltas = Counter({closed: -count for closed, count in counts.items()})
+    deltas[status.is_closed] += sum(counts.values())
+    record(deltas)
+
+
+def remove_tasks(queryset):
+    """Roll up tasks before they are deleted with a set-based DELETE."""
+    record({
+        closed: -count for closed, count in count_closed(queryset).items()
+    })
+
+
+def close_status(is_closed, tasks_count):
+    """Move the tasks of a status whose ``is_closed`` flipped."""
+    record({is_closed: tasks_count, not is_closed: -tasks_count})
+
+
+def totals(statuses):
+    counts = Counter()
+    for status in statuses:
+        counts[status.is_closed] += status.tasks_count
+    return counts
+
+
+def undo(counts, rollup):
+    counts[False] -= rollup.opened
+    counts[True] -= rollup.closed
+
+
+def trend(current, days):
+    """Open and closed tasks at the end of each of the last ``days``.
+
+    Walks back from the ``current`` totals, undoing one rollup per day.
+    """
+    today = timezone.localdate()
+    rollups = {
+        rollup.day: rollup for rollup in
+        TaskRollup.objects.filter(day__gt=today - timedelta(days=days))
+    }
+    counts = Counter(current)
+    # Imported tasks may be created in the future.
+    for rollup in rollups.values():
+        if rollup.day > today:
+            undo(counts, rollup)
+    points = []
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        points.append((day, counts[False], counts[True]))
+        if day in rollups:
+            undo(counts, rollups[day])
+    return points[::-1]
+
+
+def dashboard(limit=10, days=14):
+    """Task counts for the index page, read from counters and rollups."""
+    statuses = list(Status.objects.order_by('-tasks_count', 'name'))
+    current = totals(statuses)
+    executors = get_user_model().objects.filter(
+        profile__assigned_tasks_count__gt=0
+    ).annotate(
+        tasks_count=F('profile__assigned_tasks_count')
+    ).order_by('-tasks_count', 'pk')[:limit]
+    labels = Label.objects.filter(tasks_count__gt=0).order_by(
+        '-tasks_count', 'name'
+    )[:limit]
+    return {
+        'open': current[False],
+        'closed': current[True],
+        'statuses': statuses,
+        'executors': executors,
+        'labels': labels,
+        'trend': trend(current, days),
+    }
+
+
+def rebuild():
+    """Recompute every rollup from the tasks table.
+
+    Status changes are not stored, so each task is rolled up on the day it
+    was created in its current status.
+    """
+    by_day = defaultdict(Counter)
+    rows = Task.objects.annotate(day=TruncDate('created_at')).order_by() \
+        .values('day', 'status__is_closed').annotate(count=Count('pk')) \
+        .values_list('day', 'status__is_closed', 'count')
+    for day, closed, count in rows.iterator():
+        by_day[day][closed] += count
+    TaskRollup.objects.all().delete()
+    TaskRollup.objects.bulk_create(
+        TaskRollup(day=day, opened=counts[False], closed=counts[True])
+        for day, counts in by_day.items()
+    )
+
+
+def check():
+    """Return the rolled up and the actual (open, closed) totals."""
+    rolled_up = TaskRollup.objects.aggregate(
+        opened=Sum('opened', default=0), closed=Sum('closed', default=0)
+    )
+    actual = count_closed(Task.objects.all())
+    return (
+        (rolled_up['opened'], rolled_up['closed']),
+        (actual[False], actual[True]),
+    )
@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, \
+    pre_delete, pre_save
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, rollups
+from task_manager.tasks.choices import invalidate_cached_choices
+from task_manager.tasks.models import Task, TaskLabel
+
+# Saves touching only these fields do not change any choice label.
+IGNORED_UPDATE_FIELDS = frozenset({'last_login'})
+
+
+def invalidate_choices(sender, update_fields=None, using=None, **kwargs):
+    if update_fields and IGNORED_UPDATE_FIELDS.issuperset(update_fields):
+        return
+    # Dropped earlier, a request could cache the uncommitted choices again.
+    transaction.on_commit(lambda: invalidate_cached_choices(sender),
+                          using=using)
+
+
+for model in (Status, Label, get_user_model()):
+    post_save.connect(invalidate_choices, sender=model)
+    post_delete.connect(invalidate_choices, sender=model)
+
+
+def remember_counted_values(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._counted_values = {}
+        return
+    instance._counted_values = Task.objects.filter(pk=instance.pk).values(
+        *counters.TASK_COUNTED_FIELDS
+    ).first() or {}
+
+
+def count_saved_task(sender, instance, raw=False, **kwargs):
+    if not raw:
+        counters.update_task_counters(
+            instance._counted_values, counters.task_counted_values(instance)
+        )
+        rollups.move_task(
+            instance._counted_values.get('status_id'), instance.status_id
+        )
+
+
+def remember_task_labels(sender, instance, **kwargs):
+    instance._counted_label_ids = list(
+        TaskLabel.objects.filter(task=instance).values_list(
+            'label_id', flat=True
+        )
+    )
+
+
+def uncount_deleted_task(sender, instance, **kwargs):
+    counters.update_task_counters(
+        counters.task_counted_values(instance), {}
+    )
+    counters.update_label_counters(instance._counted_label_ids, -1)
+    rollups.move_task(instance.status_id, None)
+
+
+def remember_status_counts(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._rolled_up = {}
+        return
+    instance._rolled_up = Status.objects.filter(pk=instance.pk).values(
+        'is_closed', 'tasks_count'
+    ).first() or {}
+
+
+def roll_up_closed_status(sender, instance, raw=False, **kwargs):
+    was_closed = instance._rolled_up.get('is_closed', instance.is_closed)
+    if was_closed != instance.is_closed:
+        rollups.close_status(
+            instance.is_closed, instance._rolled_up['tasks_count']
+        )
+
+
+def linked_label_ids(instance, reverse, pk_set):
+    links = TaskLabel.objects.filter(**{'label' if reverse else 'task': instance})
+    if pk_set is not None:
+        links = links.filter(
+            **{'task_id__in' if reverse else 'label_id__in': pk_set}
+        )
+    return list(links.values_list('label_id', flat=True))
+
+
+def count_task_labels(sender, instance, action, reverse, pk_set, **kwargs):
+    # Django reports only the new links in post_add, but every requested
+    # pk in pre/post_remove, so removed links are read before the DELETE.
+    if action == 'post_add':
+        label_ids = [instance.pk] * len(pk_set) if reverse else pk_set
+        counters.update_label_counters(label_ids, 1)
+    elif action in ('pre_remove', 'pre_clear'):
+        instance._counted_label_ids = linked_label_ids(
+            instance, reverse, pk_set if action == 'pre_remove' else None
+        )
+    elif action in ('post_remove', 'post_clear'):
+        counters.update_label_counters(instance._counted_label_ids, -1)
+
+
+pre_save.connect(remember_counted_values, sender=Task)
+post_save.connect(count_saved_task, sender=Task)
+pre_delete.connect(remember_task_labels, sender=Task)
+post_delete.connect(uncount_deleted_task, sender=Task)
+m2m_changed.connect(count_task_labels, sender=TaskLabel)
+pre_save.connect(remember_status_counts, sender=Status)
+post_save.connect(roll_up_closed_status, sender=Status)
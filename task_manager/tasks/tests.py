@@ -1,13 +1,36 @@
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import patch
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F, OuterRef, Subquery
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
-from task_manager.tasks.models import Task
+from task_manager.tasks import rollups
+from task_manager.tasks.bulk import apply_bulk_action
+from task_manager.tasks.checks import check_bulk_delete_relations
+from task_manager.tasks.choices import choices_cache_key
+from task_manager.tasks.filters import TaskFilterSet
+from task_manager.tasks.forms import TaskForm
+from task_manager.tasks.models import Task, TaskEvent, TaskLabel, TaskRollup
+from task_manager.tasks.views import TaskDetailView, TaskFilterView
 from task_manager.tests import SetUpLoggedUserMixin
+from task_manager.users.models import Profile
+from task_manager.versions.models import ModelVersion
 
 
 class SetUpLoggedUserAndTestDataTaskMixin(SetUpLoggedUserMixin):
@@ -107,6 +130,508 @@ class LoggedUserAndTestTaskFilterView(SetUpLoggedUserAndTestDataTaskMixin, TestC
         response = self.client.get(self.url)
         self.assertRedirects(response, settings.LOGIN_URL)
 
+    def test_task_filter_view_query_count_does_not_depend_on_rows(self):
+        test_label = Label.objects.create(name='Test label')
+        self.test_task.labels.set([test_label])
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as few_rows:
+            self.client.get(self.url)
+
+        for number in range(20):
+            task = Task.objects.create(name=f'Extra task {number}',
+                                       status=self.test_status,
+                                       creator=self.other_user,
+                                       executor=self.logged_user)
+            task.labels.set([test_label])
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(many_rows), len(few_rows))
+
+
+class TaskRowFragmentCache(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        caches['fragments'].clear()
+
+    def test_rows_are_cached_until_they_change(self):
+        self.client.get(reverse('tasks_list'))
+        other_status = Status.objects.create(name='Other status')
+        apply_bulk_action(Task.objects.all(), 'status', other_status)
+        response = self.client.get(reverse('tasks_list'))
+        self.assertContains(response, 'Other status')
+
+        other_status.name = 'Renamed status'
+        with self.captureOnCommitCallbacks(execute=True):
+            other_status.save()
+        response = self.client.get(reverse('tasks_list'))
+        self.assertContains(response, 'Renamed status')
+
+        self.test_task.refresh_from_db()
+        self.test_task.name = 'Renamed task'
+        self.test_task.save()
+        response = self.client.get(reverse('tasks_list'))
+        self.assertContains(response, 'Renamed task')
+
+    def test_rows_are_kept_on_unrelated_changes(self):
+        self.client.get(reverse('tasks_list'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name='Other status')
+            get_user_model().objects.create(username='new_user')
+            self.test_status.save()
+
+        with patch.object(LocMemCache, 'set', autospec=True,
+                          side_effect=LocMemCache.set) as cache_set:
+            response = self.client.get(reverse('tasks_list'))
+
+        self.assertContains(response, self.test_task.name)
+        rendered = [call.args[1] for call in cache_set.call_args_list
+                    if call.args[1].startswith('template.cache.task_row')]
+        self.assertEqual(rendered, [])
+
+    def test_nav_is_cached_per_auth_state(self):
+        self.client.get(reverse('index'))
+        response = self.client.get(reverse('tasks_list'))
+        self.assertContains(response, reverse('logout'))
+
+        self.client.logout()
+        response = self.client.get(reverse('index'))
+        self.assertNotContains(response, reverse('logout'))
+        self.assertContains(response, reverse('user_create'))
+
+
+@override_settings(PAGINATION_PAGE_SIZE=2, PAGINATION_MAX_PAGE_SIZE=3)
+class LoggedUserAndTestTaskFilterViewPagination(SetUpLoggedUserAndTestDataTaskMixin,
+                                                TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_status = Status.objects.create(name='Other test status')
+        for number in range(4):
+            Task.objects.create(name=f'Paginated task {number}',
+                                status=cls.other_status,
+                                creator=cls.other_user)
+        cls.url = reverse('tasks_list')
+
+    def collect_pages(self, params):
+        tasks, url = [], self.url
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            tasks.extend(response.context['tasks'])
+            page = response.context['page_obj']
+            url = self.url + page.next_page_url if page.has_next() else None
+            params = None
+        return tasks
+
+    def test_task_filter_view_pages_cover_all_tasks_in_order(self):
+        self.assertEqual(
+            self.collect_pages({}),
+            list(Task.objects.order_by('created_at', 'id'))
+        )
+
+    def test_task_filter_view_pages_keep_filter(self):
+        self.assertEqual(
+            self.collect_pages({'status': self.other_status.pk}),
+            list(Task.objects.filter(status=self.other_status)
+                 .order_by('created_at', 'id'))
+        )
+
+    def test_task_filter_view_previous_page(self):
+        first_page = self.client.get(self.url).context['page_obj']
+        second_page = self.client.get(
+            self.url + first_page.next_page_url).context['page_obj']
+        response = self.client.get(self.url + second_page.previous_page_url)
+
+        self.assertEqual(list(response.context['tasks']), list(first_page))
+        self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_task_filter_view_page_size_is_capped(self):
+        response = self.client.get(self.url, {'page_size': 100})
+        self.assertEqual(len(response.context['tasks']), 3)
+
+    def test_task_filter_view_tampered_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'tampered'})
+        self.assertEqual(response.status_code, 404)
+
+
+class LoggedUserAndTestTaskFilterViewSearch(SetUpLoggedUserAndTestDataTaskMixin,
+                                            TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.description_task = Task.objects.create(
+            name='Prepare report',
+            description='Collect numbers for the quarterly deployment review '
+                        'and send them to the whole team before Friday',
+            status=cls.test_status,
+            creator=cls.other_user,
+        )
+        cls.name_task = Task.objects.create(name='Deployment',
+                                            status=cls.test_status,
+                                            creator=cls.other_user)
+        cls.url = reverse('tasks_list')
+
+    def test_task_filter_view_search_ranked(self):
+        response = self.client.get(self.url, {'search': 'deployment'})
+
+        self.assertEqual(list(response.context['tasks']),
+                         [self.name_task, self.description_task])
+
+    def test_task_filter_view_search_follows_updates(self):
+        self.name_task.name = 'Release'
+        self.name_task.save()
+        response = self.client.get(self.url, {'search': 'deployment'})
+
+        self.assertEqual(list(response.context['tasks']), [self.description_task])
+
+    @override_settings(PAGINATION_PAGE_SIZE=1)
+    def test_task_filter_view_search_pages(self):
+        first_page = self.client.get(self.url, {'search': 'deployment'})
+        next_url = self.url + first_page.context['page_obj'].next_page_url
+        second_page = self.client.get(next_url)
+
+        self.assertEqual(list(first_page.context['tasks']), [self.name_task])
+        self.assertEqual(list(second_page.context['tasks']), [self.description_task])
+        self.assertFalse(second_page.context['page_obj'].has_next())
+
+    @skipUnless(connection.vendor == 'postgresql', 'needs PostgreSQL')
+    @override_settings(PAGINATION_PAGE_SIZE=2)
+    def test_task_filter_view_search_pages_through_equal_ranks(self):
+        tied = [
+            Task.objects.create(name=f'Deployment {number}',
+                                status=self.test_status,
+                                creator=self.other_user)
+            for number in range(5)
+        ]
+        tasks, url = [], f'{self.url}?search=deployment'
+        while url:
+            page = self.client.get(url).context['page_obj']
+            tasks.extend(page)
+            url = page.has_next() and self.url + page.next_page_url
+
+        self.assertEqual(len(tasks), len(set(tasks)))
+        self.assertEqual(set(tasks),
+                         {self.name_task, self.description_task, *tied})
+
+    def test_task_search_in_subquery(self):
+        searched = Task.objects.search('deployment')
+        ranked = searched.filter(pk=OuterRef('pk')).values('search_rank')
+        tasks = Task.objects.filter(pk__in=searched).annotate(rank=Subquery(ranked))
+
+        self.assertEqual(list(tasks.order_by('-rank')),
+                         [self.name_task, self.description_task])
+        label = Label.objects.create(name='Release')
+        self.name_task.labels.add(label)
+        links = TaskLabel.objects.filter(task__in=searched.filter(creator=self.other_user))
+        self.assertEqual(list(links.values_list('task', flat=True)), [self.name_task.pk])
+
+    def test_task_filter_view_search_quotes_syntax(self):
+        response = self.client.get(self.url, {'search': '"report" OR ('})
+        self.assertEqual(response.status_code, 200)
+
+
+class TaskApiViews(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.test_label = Label.objects.create(name='Test label')
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.test_task.labels.set([cls.test_label])
+        cls.url = reverse('tasks_api')
+
+    def test_task_api_list(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        task = response.json()['results'][0]
+        self.assertEqual(task['name'], self.test_task.name)
+        self.assertEqual(task['status'], self.test_status.name)
+        self.assertEqual(task['labels'], [self.test_label.name])
+        self.assertIsNone(task['executor'])
+        self.assertIsNone(response.json()['next'])
+
+    def test_task_api_list_filter_and_sparse_fields(self):
+        other_status = Status.objects.create(name='Other status')
+        response = self.client.get(
+            self.url, {'status': other_status.pk, 'fields': 'id,name'}
+        )
+        self.assertEqual(response.json()['results'], [])
+
+        response = self.client.get(self.url, {'fields': 'id,name'})
+        self.assertEqual(response.json()['results'],
+                         [{'id': self.test_task.pk, 'name': self.test_task.name}])
+
+    def test_task_api_list_unknown_field(self):
+        response = self.client.get(self.url, {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_task_api_list_invalid_filter(self):
+        response = self.client.get(self.url, {'status': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(PAGINATION_PAGE_SIZE=1)
+    def test_task_api_list_cursor(self):
+        Task.objects.create(name='Second task', status=self.test_status,
+                            creator=self.logged_user)
+        first_page = self.client.get(self.url, {'fields': 'name'}).json()
+        second_page = self.client.get(first_page['next']).json()
+
+        self.assertEqual(first_page['results'], [{'name': 'Test task'}])
+        self.assertEqual(second_page['results'], [{'name': 'Second task'}])
+
+    def test_task_api_not_modified(self):
+        response = self.client.get(self.url)
+        etag = response.headers['ETag']
+
+        # The session, the user and the version stamps.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_task.labels.clear()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_task_api_not_modified_since(self):
+        response = self.client.get(self.url)
+        last_modified = response.headers['Last-Modified']
+
+        response = self.client.get(self.url,
+                                   HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_task_api_detail(self):
+        url = reverse('task_api_detail', kwargs={'pk': self.test_task.pk})
+        response = self.client.get(url, {'fields': 'name,creator'})
+
+        self.assertEqual(response.json(), {
+            'name': self.test_task.name,
+            'creator': self.other_user.username,
+        })
+        url = reverse('task_api_detail', kwargs={'pk': 0})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_task_api_not_logged_in(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+
+class TaskExportView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.test_label = Label.objects.create(name='Test label')
+        cls.test_task.labels.set([cls.test_label])
+        cls.url = reverse('tasks_export')
+
+    def export(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_task_export_csv(self):
+        lines = self.export({'format': 'csv'}).splitlines()
+
+        self.assertEqual(lines[0],
+                         'id,name,description,status,creator,executor,labels,created_at')
+        self.assertIn('Test task,,Test status,nelson_mandela,,Test label', lines[1])
+
+    def test_task_export_ndjson_with_filter(self):
+        Task.objects.create(name='Logged user task', status=self.test_status,
+                            creator=self.logged_user)
+        lines = self.export({'format': 'ndjson', 'own_tasks': 'on'}).splitlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['name'], 'Logged user task')
+
+    @override_settings(EXPORT_CHUNK_SIZE=50)
+    def test_task_export_query_count_does_not_depend_on_rows(self):
+        self.client.get(reverse('index'))
+        with CaptureQueriesContext(connection) as few_rows:
+            self.export({'format': 'ndjson'})
+
+        for number in range(10):
+            task = Task.objects.create(name=f'Exported task {number}',
+                                       status=self.test_status,
+                                       creator=self.other_user)
+            task.labels.set([self.test_label])
+        with CaptureQueriesContext(connection) as many_rows:
+            self.export({'format': 'ndjson'})
+
+        self.assertEqual(len(many_rows), len(few_rows))
+
+    async def test_task_export_streams_under_asgi(self):
+        await self.async_client.aforce_login(self.logged_user)
+        response = await self.async_client.get(self.url, {'format': 'csv'})
+
+        self.assertTrue(response.is_async)
+        lines = b''.join([line async for line in response.streaming_content])
+        self.assertIn('Test task,,Test status,nelson_mandela,,Test label',
+                      lines.decode())
+
+    def test_task_export_unknown_format(self):
+        response = self.client.get(self.url, {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_task_export_not_logged_in(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertRedirects(response, settings.LOGIN_URL)
+
+
+class TaskBulkActionView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_status = Status.objects.create(name='Other status')
+        cls.test_label = Label.objects.create(name='Test label')
+        cls.own_tasks = [
+            Task.objects.create(name=f'Own task {number}',
+                                status=cls.test_status,
+                                creator=cls.logged_user)
+            for number in range(3)
+        ]
+        cls.url = reverse('tasks_bulk')
+
+    def post_action(self, data, query=''):
+        return self.client.post(f'{self.url}{query}', data)
+
+    def test_bulk_change_status_of_selected(self):
+        selected = [task.pk for task in self.own_tasks[:2]]
+        # The task version is bumped after the commit.
+        with self.assertNumQueries(13):
+            response = self.post_action({'action': 'status',
+                                         'status': self.other_status.pk,
+                                         'tasks': selected})
+        self.assertRedirects(response, reverse('tasks_list'))
+
+        self.assertQuerysetEqual(
+            Task.objects.filter(status=self.other_status).order_by('pk'),
+            self.own_tasks[:2]
+        )
+
+    def test_bulk_change_executor_of_filtered(self):
+        response = self.post_action(
+            {'action': 'executor', 'executor': self.other_user.pk,
+             'select_all': 'on'},
+            '?own_tasks=on',
+        )
+        self.assertRedirects(response, reverse('tasks_list') + '?own_tasks=on',
+                             fetch_redirect_response=False)
+
+        self.assertEqual(
+            Task.objects.filter(executor=self.other_user).count(), 3
+        )
+        self.test_task.refresh_from_db()
+        self.assertIsNone(self.test_task.executor)
+
+    def test_bulk_add_and_remove_label(self):
+        self.own_tasks[0].labels.add(self.test_label)
+        self.post_action({'action': 'add_label', 'label': self.test_label.pk,
+                          'select_all': 'on'})
+        self.assertEqual(self.test_label.tasks.count(), 4)
+
+        self.post_action({'action': 'remove_label', 'label': self.test_label.pk,
+                          'tasks': [self.test_task.pk]})
+        self.assertEqual(self.test_label.tasks.count(), 3)
+        self.assertFalse(self.test_task.labels.exists())
+
+    def test_bulk_delete_only_own_tasks(self):
+        self.own_tasks[0].labels.add(self.test_label)
+        self.post_action({'action': 'delete', 'select_all': 'on'})
+
+        self.assertQuerysetEqual(Task.objects.all(), [self.test_task])
+        self.assertFalse(self.test_label.tasks.exists())
+
+    def test_bulk_delete_filtered_by_label(self):
+        self.own_tasks[0].labels.add(self.test_label)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post_action({'action': 'delete', 'select_all': 'on'},
+                                        f'?label={self.test_label.pk}')
+
+        self.assertRedirects(response, reverse('tasks_list') + f'?label={self.test_label.pk}',
+                             fetch_redirect_response=False)
+        self.assertFalse(Task.objects.filter(pk=self.own_tasks[0].pk).exists())
+        self.assertEqual(Task.objects.count(), 3)
+        self.assertEqual(TaskEvent.objects.filter(kind=TaskEvent.Kind.DELETED).count(), 1)
+        call_command('reconcile_task_counters', '--check', stdout=StringIO())
+
+    def test_bulk_actions_filtered_by_search(self):
+        response = self.post_action({'action': 'status', 'status': self.other_status.pk,
+                                     'select_all': 'on'},
+                                    '?search=own')
+        self.assertRedirects(response, reverse('tasks_list') + '?search=own',
+                             fetch_redirect_response=False)
+        self.assertQuerysetEqual(
+            Task.objects.filter(status=self.other_status).order_by('pk'),
+            self.own_tasks
+        )
+
+        self.post_action({'action': 'delete', 'select_all': 'on'}, '?search=own')
+        self.assertQuerysetEqual(Task.objects.all(), [self.test_task])
+        call_command('reconcile_task_counters', '--check', stdout=StringIO())
+
+    def test_bulk_remove_label_filtered_by_label(self):
+        self.own_tasks[0].labels.add(self.test_label)
+        self.own_tasks[1].labels.add(self.test_label)
+        version = ModelVersion.objects.cache_key(Task)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_action({'action': 'remove_label', 'label': self.test_label.pk,
+                              'select_all': 'on'},
+                             f'?label={self.test_label.pk}')
+
+        self.assertFalse(self.test_label.tasks.exists())
+        self.assertNotEqual(ModelVersion.objects.cache_key(Task), version)
+
+    def test_bulk_delete_relations_check(self):
+        self.assertEqual(check_bulk_delete_relations(None), [])
+        with patch('task_manager.tasks.checks.DELETED_RELATIONS', ()):
+            errors = check_bulk_delete_relations(None)
+        self.assertEqual([error.id for error in errors], ['tasks.E001'])
+
+    def test_bulk_action_requires_value(self):
+        self.post_action({'action': 'status', 'tasks': [self.test_task.pk]})
+        self.test_task.refresh_from_db()
+        self.assertEqual(self.test_task.status, self.test_status)
+
+    def test_bulk_action_without_selection(self):
+        self.post_action({'action': 'delete'})
+        self.assertEqual(Task.objects.count(), 4)
+
+    def test_bulk_action_not_logged_in(self):
+        self.client.logout()
+        response = self.post_action({'action': 'delete', 'select_all': 'on'})
+        self.assertRedirects(response, settings.LOGIN_URL)
+        self.assertEqual(Task.objects.count(), 4)
+
+
+class AsyncTaskViews(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    def test_read_views_are_async(self):
+        for view in (TaskFilterView, TaskDetailView):
+            self.assertTrue(view.view_is_async, view)
+
+    async def test_task_list_and_detail_with_async_client(self):
+        response = await self.async_client.get(reverse('tasks_list'))
+        self.assertRedirects(response, reverse('login'),
+                             fetch_redirect_response=False)
+
+        await self.async_client.aforce_login(self.logged_user)
+        response = await self.async_client.get(reverse('tasks_list'))
+        self.assertContains(response, self.test_task.name)
+
+        response = await self.async_client.get(
+            reverse('task_detail', kwargs={'pk': self.test_task.pk}))
+        self.assertContains(response, self.test_status.name)
+
+        response = await self.async_client.get(
+            reverse('task_detail', kwargs={'pk': 0}))
+        self.assertEqual(response.status_code, 404)
+
 
 class LoggedUserAndTestTaskCreateView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
     @classmethod
@@ -142,6 +667,55 @@ class LoggedUserAndTestTaskCreateView(SetUpLoggedUserAndTestDataTaskMixin, TestC
         self.assertFalse(Task.objects.filter(name=self.data_to_create_task).exists())
 
 
+class CachedTaskChoices(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.test_label = Label.objects.create(name='Test label')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def assertRendersWithoutQueries(self, form_factory):
+        str(form_factory())
+        with self.assertNumQueries(0):
+            rendered = str(form_factory())
+
+        self.assertIn(self.test_status.name, rendered)
+        self.assertIn(self.test_label.name, rendered)
+
+    def test_task_form_renders_from_warm_cache(self):
+        self.assertRendersWithoutQueries(TaskForm)
+
+    def test_task_filter_form_renders_from_warm_cache(self):
+        self.assertRendersWithoutQueries(lambda: TaskFilterSet().form)
+
+    def test_choices_invalidated_on_save_and_delete(self):
+        url = reverse('task_create')
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name='New status')
+        self.assertContains(self.client.get(url), 'New status')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_label.delete()
+        self.assertNotContains(self.client.get(url), self.test_label.name)
+
+    def test_choices_and_versions_change_after_commit(self):
+        self.client.get(reverse('task_create'))
+        stamp = ModelVersion.objects.stamp(Status)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Status.objects.create(name='New status')
+            self.assertIsNotNone(cache.get(choices_cache_key(Status)))
+            self.assertEqual(ModelVersion.objects.stamp(Status), stamp)
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(choices_cache_key(Status)))
+        self.assertNotEqual(ModelVersion.objects.stamp(Status), stamp)
+
+
 class LoggedUserAndTestTaskUpdateView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -220,3 +794,520 @@ class LoggedUserAndTestTaskDeleteView(SetUpLoggedUserAndTestDataTaskMixin, TestC
         self.assertRedirects(response, settings.LOGIN_URL)
 
         self.assertTrue(Task.objects.filter(pk=self.logged_user_task.pk).exists())
+
+
+class ExplainTaskFiltersCommand(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.test_task.labels.set([Label.objects.create(name='Test label')])
+
+    def test_explain_task_filters_uses_indexes(self):
+        out = StringIO()
+        call_command('explain_task_filters', '--check', stdout=out)
+
+        self.assertIn('status, executor, label, own_tasks', out.getvalue())
+        self.assertIn('task_status_executor_idx', out.getvalue())
+
+
+class SeedAndBenchmarkCommands(TestCase):
+    def test_seed_benchmark(self):
+        call_command('seed_benchmark', users=3, statuses=2, labels=4,
+                     tasks=25, batch_size=10, seed=1, stdout=StringIO())
+
+        self.assertEqual(get_user_model().objects.count(), 3)
+        self.assertEqual(Status.objects.count(), 2)
+        self.assertEqual(Label.objects.count(), 4)
+        self.assertEqual(Task.objects.count(), 25)
+        self.assertTrue(Task.labels.through.objects.exists())
+
+    def test_benchmark_views(self):
+        call_command('seed_benchmark', users=2, statuses=1, labels=2,
+                     tasks=5, seed=1, stdout=StringIO())
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('benchmark_views', repeat=1, output=output.name,
+                         stdout=StringIO())
+            report = json.load(output)
+
+        self.assertEqual(report['meta']['tasks'], 5)
+        self.assertEqual(report['results']['GET tasks_list']['status'], 200)
+        self.assertGreater(report['results']['GET tasks_list']['render_ms'], 0)
+        self.assertIn('POST task_update', report['results'])
+        self.assertEqual(Task.objects.count(), 5)
+
+    def test_benchmark_views_without_fragment_cache(self):
+        call_command('seed_benchmark', users=2, statuses=1, labels=2,
+                     tasks=5, seed=1, stdout=StringIO())
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('benchmark_views', repeat=1, output=output.name,
+                         no_fragment_cache=True, stdout=StringIO())
+            report = json.load(output)
+
+        self.assertFalse(report['meta']['fragment_cache'])
+
+    def test_benchmark_connections(self):
+        out = StringIO()
+        call_command('benchmark_connections', requests=3, stdout=out)
+
+        self.assertIn('connect: mean', out.getvalue())
+        self.assertIn('connect + SELECT 1: mean', out.getvalue())
+
+
+class ImportTasksCommand(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    def import_tasks(self, content, suffix, *args):
+        out, err = StringIO(), StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix=suffix) as source:
+            source.write(content)
+            source.flush()
+            call_command('import_tasks', source.name, *args,
+                         stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_tasks_csv(self):
+        self.import_tasks(
+            'name,description,status,creator,executor,labels\n'
+            'Imported,Some text,Test status,nelson_mandela,,\n'
+            'Imported 2,,New status,new_user,albert_einstein,bug;urgent\n',
+            '.csv', '--batch-size', '1',
+        )
+
+        task = Task.objects.get(name='Imported 2')
+        self.assertEqual(task.status.name, 'New status')
+        self.assertEqual(task.creator.username, 'new_user')
+        self.assertEqual(task.executor, self.logged_user)
+        self.assertEqual(sorted(task.labels.values_list('name', flat=True)),
+                         ['bug', 'urgent'])
+        self.assertEqual(Task.objects.get(name='Imported').status, self.test_status)
+        event = TaskEvent.objects.get(task=task)
+        self.assertEqual(event.kind, TaskEvent.Kind.CREATED)
+        self.assertEqual(len(event.changes['labels']['+']), 2)
+
+    def test_import_tasks_ndjson_reports_row_errors(self):
+        out, err = self.import_tasks(
+            '{"name": "Imported", "status": "Test status", '
+            '"creator": "nelson_mandela", "labels": ["bug"]}\n'
+            '{"name": "Test task", "status": "Test status", '
+            '"creator": "nelson_mandela"}\n'
+            '{"name": "No status", "creator": "nelson_mandela"}\n'
+            'not json\n',
+            '.ndjson',
+        )
+
+        self.assertTrue(Task.objects.filter(name='Imported').exists())
+        self.assertIn('line 2: task "Test task" already exists', err)
+        self.assertIn('line 3: name, status and creator are required', err)
+        self.assertIn('line 4: invalid JSON', err)
+        self.assertIn('1 imported, 3 failed', out)
+
+    def assert_row_error(self, row, message):
+        out, err = self.import_tasks(row + '\n', '.ndjson')
+        self.assertIn(f'line 1: {message}', err)
+        self.assertIn('0 imported, 1 failed', out)
+
+    def test_import_tasks_rejects_non_object_rows(self):
+        self.assert_row_error('[1, 2]', 'row must be an object')
+
+    def test_import_tasks_rejects_non_string_fields(self):
+        self.assert_row_error(
+            '{"name": "Imported", "status": 5, "creator": "nelson_mandela"}',
+            'status must be a string',
+        )
+
+    def test_import_tasks_rejects_impossible_dates(self):
+        self.assert_row_error(
+            '{"name": "Imported", "status": "Test status", '
+            '"creator": "nelson_mandela", '
+            '"created_at": "2024-13-45T00:00:00"}',
+            'invalid created_at',
+        )
+
+    def test_import_tasks_rejects_labels_that_are_not_a_list(self):
+        self.assert_row_error(
+            '{"name": "Imported", "status": "Test status", '
+            '"creator": "nelson_mandela", "labels": "bug"}',
+            'labels must be a list of strings',
+        )
+        self.assertFalse(Label.objects.filter(name='b').exists())
+
+    def test_import_tasks_rejects_too_long_names(self):
+        self.assert_row_error(
+            '{"name": "%s", "status": "Test status", '
+            '"creator": "nelson_mandela"}' % ('x' * 257),
+            'name is longer than 256 characters',
+        )
+
+    def test_import_tasks_dry_run(self):
+        out, _err = self.import_tasks(
+            '{"name": "Imported", "status": "New status", '
+            '"creator": "nelson_mandela"}\n',
+            '.ndjson', '--dry-run',
+        )
+
+        self.assertIn('1 imported', out)
+        self.assertFalse(Task.objects.filter(name='Imported').exists())
+        self.assertFalse(Status.objects.filter(name='New status').exists())
+
+
+class TaskCounters(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_status = Status.objects.create(name='Other status')
+        cls.label = Label.objects.create(name='bug')
+
+    def assertCountersMatch(self):
+        call_command('reconcile_task_counters', '--check', stdout=StringIO())
+
+    def refresh(self):
+        for obj in (self.test_status, self.other_status, self.label):
+            obj.refresh_from_db()
+        self.logged_user.profile.refresh_from_db()
+        self.other_user.profile.refresh_from_db()
+
+    def test_counters_follow_task_changes(self):
+        task = Task.objects.create(name='Counted', status=self.other_status,
+                                   creator=self.logged_user,
+                                   executor=self.other_user)
+        task.labels.add(self.label)
+        self.refresh()
+        self.assertEqual(self.other_status.tasks_count, 1)
+        self.assertEqual(self.label.tasks_count, 1)
+        self.assertEqual(self.logged_user.profile.created_tasks_count, 1)
+        self.assertEqual(self.other_user.profile.assigned_tasks_count, 1)
+
+        task.status = self.test_status
+        task.executor = None
+        task.save()
+        self.refresh()
+        self.assertEqual(self.other_status.tasks_count, 0)
+        self.assertEqual(self.test_status.tasks_count, 2)
+        self.assertEqual(self.other_user.profile.assigned_tasks_count, 0)
+
+        task.delete()
+        self.refresh()
+        self.assertEqual(self.test_status.tasks_count, 1)
+        self.assertEqual(self.label.tasks_count, 0)
+        self.assertEqual(self.logged_user.profile.created_tasks_count, 0)
+        self.assertCountersMatch()
+
+    def test_counters_follow_label_changes(self):
+        other_label = Label.objects.create(name='urgent')
+        self.test_task.labels.set([self.label, other_label])
+        self.test_task.labels.remove(self.label, self.label)
+        self.label.tasks.add(self.test_task)
+        self.label.tasks.add(self.test_task)
+        other_label.tasks.remove(self.test_task)
+        self.test_task.labels.clear()
+        self.refresh()
+        self.assertEqual(self.label.tasks_count, 0)
+        self.assertCountersMatch()
+
+    def test_counters_follow_bulk_actions(self):
+        tasks = Task.objects.all()
+        for action, value in (('status', self.other_status),
+                              ('executor', self.logged_user),
+                              ('add_label', self.label),
+                              ('remove_label', self.label),
+                              ('add_label', self.label),
+                              ('delete', None)):
+            apply_bulk_action(tasks, action, value)
+            self.assertCountersMatch()
+
+    def test_reconcile_refreshes_pages(self):
+        url = reverse('statuses_list')
+        etag = self.client.get(url).headers['ETag']
+        Status.objects.update(tasks_count=5)
+        call_command('reconcile_task_counters', stdout=StringIO())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_drifted_counters_stop_at_zero(self):
+        Status.objects.update(tasks_count=0)
+        self.test_task.delete()
+        self.test_status.refresh_from_db()
+        self.assertEqual(self.test_status.tasks_count, 0)
+
+    def test_missing_profiles_are_created_when_counted(self):
+        self.other_user.profile.delete()
+        Task.objects.create(name='Counted', status=self.test_status,
+                            creator=self.logged_user,
+                            executor=self.other_user)
+        profile = Profile.objects.get(user=self.other_user)
+        self.assertEqual(profile.assigned_tasks_count, 1)
+        self.assertEqual(profile.created_tasks_count, 0)
+
+    def test_counters_follow_import(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            file.write('name,status,creator,executor,labels\n'
+                       'Imported,Test status,new_user,nelson_mandela,bug;new\n')
+            file.flush()
+            call_command('import_tasks', file.name, stdout=StringIO(),
+                         stderr=StringIO())
+        self.assertCountersMatch()
+
+    def test_reconcile_fixes_drift(self):
+        Status.objects.update(tasks_count=5)
+        with self.assertRaises(CommandError):
+            self.assertCountersMatch()
+
+        out = StringIO()
+        call_command('reconcile_task_counters', stdout=out)
+        self.assertIn('statuses.Status.tasks_count: 2 wrong', out.getvalue())
+        self.assertCountersMatch()
+
+    def test_usage_counts_on_list_pages(self):
+        response = self.client.get(reverse('statuses_list'))
+        self.assertContains(response, '<td>1</td>', html=True)
+        response = self.client.get(reverse('user_list'))
+        self.assertContains(response, '<td>1</td>', html=True)
+
+
+class TaskEventLog(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_status = Status.objects.create(name='Other status')
+        cls.test_label = Label.objects.create(name='Test label')
+        cls.own_task = Task.objects.create(name='Own task',
+                                           status=cls.test_status,
+                                           creator=cls.logged_user)
+
+    def last_event(self):
+        return TaskEvent.objects.order_by('id').last()
+
+    def test_create_logs_initial_values(self):
+        self.client.post(reverse('task_create'), {
+            'name': 'New task', 'status': self.test_status.pk,
+            'labels': [self.test_label.pk],
+        })
+
+        event = self.last_event()
+        self.assertEqual(event.kind, TaskEvent.Kind.CREATED)
+        self.assertEqual(event.actor, self.logged_user)
+        self.assertEqual(event.changes, {
+            'name': [None, 'New task'],
+            'status': [None, self.test_status.pk],
+            'labels': {'+': [self.test_label.pk]},
+        })
+
+    def test_update_logs_only_changed_fields(self):
+        self.own_task.labels.set([self.test_label])
+        self.client.post(
+            reverse('task_update', kwargs={'pk': self.own_task.pk}),
+            {'name': 'Own task', 'description': 'Not logged',
+             'status': self.other_status.pk,
+             'executor': self.logged_user.pk},
+        )
+
+        self.assertEqual(self.last_event().changes, {
+            'status': [self.test_status.pk, self.other_status.pk],
+            'executor': [None, self.logged_user.pk],
+            'labels': {'-': [self.test_label.pk]},
+        })
+
+    def test_update_without_changes_logs_nothing(self):
+        self.client.post(
+            reverse('task_update', kwargs={'pk': self.own_task.pk}),
+            {'name': 'Own task', 'status': self.test_status.pk},
+        )
+        self.assertFalse(TaskEvent.objects.exists())
+
+    def test_delete_keeps_history(self):
+        self.client.post(reverse('task_delete', kwargs={'pk': self.own_task.pk}))
+
+        event = self.last_event()
+        self.assertEqual(event.kind, TaskEvent.Kind.DELETED)
+        self.assertEqual(event.changes, {'name': ['Own task', None]})
+        response = self.client.get(
+            reverse('task_history', kwargs={'pk': event.task_id})
+        )
+        self.assertContains(response, 'Own task')
+
+    def test_bulk_actions_log_one_event_per_changed_task(self):
+        tasks = Task.objects.filter(pk__in=[self.test_task.pk,
+                                            self.own_task.pk])
+        self.test_task.labels.set([self.test_label])
+        apply_bulk_action(tasks, 'add_label', self.test_label,
+                          actor=self.logged_user)
+        apply_bulk_action(tasks, 'status', self.other_status)
+
+        events = TaskEvent.objects.order_by('id')
+        self.assertEqual(
+            [(event.task_id, event.changes) for event in events],
+            [(self.own_task.pk, {'labels': {'+': [self.test_label.pk]}}),
+             (self.test_task.pk,
+              {'status': [self.test_status.pk, self.other_status.pk]}),
+             (self.own_task.pk,
+              {'status': [self.test_status.pk, self.other_status.pk]})],
+        )
+        self.assertEqual(events[0].actor, self.logged_user)
+
+    def test_timeline_and_feed(self):
+        for status in (self.other_status, self.test_status):
+            self.client.post(
+                reverse('task_update', kwargs={'pk': self.own_task.pk}),
+                {'name': 'Own task', 'status': status.pk},
+            )
+        apply_bulk_action(Task.objects.filter(pk=self.test_task.pk),
+                          'status', self.other_status)
+
+        url = reverse('task_history', kwargs={'pk': self.own_task.pk})
+        response = self.client.get(url, {'page_size': 1})
+        self.assertEqual([event.task_id for event in response.context['events']],
+                         [self.own_task.pk])
+        field, old, new = response.context['events'][0].entries[0]
+        self.assertEqual((old, new), ('Other status', 'Test status'))
+        response = self.client.get(
+            url + response.context['page_obj'].next_page_url
+        )
+        field, old, new = response.context['events'][0].entries[0]
+        self.assertEqual((old, new), ('Test status', 'Other status'))
+
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('tasks_activity'))
+        self.assertEqual(len(response.context['events']), 3)
+        self.assertEqual(response.context['events'][0].task_name, 'Test task')
+
+
+class TaskDashboard(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.done = Status.objects.create(name='Done', is_closed=True)
+        cls.label = Label.objects.create(name='bug')
+
+    def assertDashboardMatches(self):
+        call_command('rebuild_dashboard', '--check', stdout=StringIO())
+
+    def totals(self):
+        dashboard = rollups.dashboard()
+        return dashboard['open'], dashboard['closed']
+
+    def test_rollups_follow_task_changes(self):
+        task = Task.objects.create(name='Rolled up', status=self.done,
+                                   creator=self.logged_user)
+        self.assertEqual(self.totals(), (1, 1))
+        task.status = self.test_status
+        task.save()
+        self.assertEqual(self.totals(), (2, 0))
+        self.test_status.refresh_from_db()
+        self.test_status.is_closed = True
+        self.test_status.save()
+        self.assertEqual(self.totals(), (0, 2))
+        task.delete()
+        self.assertEqual(self.totals(), (0, 1))
+        self.assertDashboardMatches()
+
+    def test_rollups_follow_bulk_actions_and_import(self):
+        apply_bulk_action(Task.objects.all(), 'status', self.done)
+        self.assertEqual(self.totals(), (0, 1))
+        self.assertDashboardMatches()
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            file.write('name,status,creator,created_at\n'
+                       'Old,Test status,new_user,2020-01-01T00:00:00+00:00\n')
+            file.flush()
+            call_command('import_tasks', file.name, stdout=StringIO(),
+                         stderr=StringIO())
+        self.assertEqual(self.totals(), (1, 1))
+        self.assertDashboardMatches()
+        apply_bulk_action(Task.objects.all(), 'delete')
+        self.assertEqual(self.totals(), (0, 0))
+        self.assertDashboardMatches()
+
+    def test_trend_walks_back_from_the_totals(self):
+        today = timezone.localdate()
+        TaskRollup.objects.create(day=today - timedelta(days=3), opened=4)
+        TaskRollup.objects.filter(day=today).update(opened=F('opened') - 4)
+        trend = rollups.trend({False: 1, True: 0}, 5)
+        self.assertEqual([point[0] for point in trend],
+                         [today - timedelta(days=days) for days in range(4, -1, -1)])
+        self.assertEqual([point[1] for point in trend], [0, 4, 4, 4, 1])
+
+    def test_rebuild_fixes_drift(self):
+        TaskRollup.objects.update(opened=5)
+        with self.assertRaises(CommandError):
+            self.assertDashboardMatches()
+
+        out = StringIO()
+        call_command('rebuild_dashboard', stdout=out)
+        self.assertIn('(5, 0) rolled up, (1, 0) actual', out.getvalue())
+        self.assertDashboardMatches()
+
+    def test_dashboard_on_index(self):
+        self.test_task.labels.add(self.label)
+        self.client.get(reverse('index'))
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('index'))
+        dashboard = response.context['dashboard']
+        self.assertEqual(list(dashboard['statuses']),
+                         [self.test_status, self.done])
+        self.assertEqual(list(dashboard['executors']), [])
+        self.assertEqual(list(dashboard['labels']), [self.label])
+        self.assertEqual(dashboard['trend'][-1][1:], (1, 0))
+        self.assertContains(response, 'Done')
+
+        self.client.logout()
+        response = self.client.get(reverse('index'))
+        self.assertNotIn('dashboard', response.context)
+
+
+class TaskPagesNotModified(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.label = Label.objects.create(name='bug')
+        cls.list_url = reverse('tasks_list')
+        cls.detail_url = reverse('task_detail', kwargs={'pk': cls.test_task.pk})
+
+    def assertNotModified(self, url, etag, **extra):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **extra)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+
+    def assertModified(self, url, etag, **extra):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        return response.headers['ETag']
+
+    def test_unchanged_pages_are_not_rendered(self):
+        for url in (self.list_url, self.detail_url):
+            response = self.client.get(url)
+            self.assertIn('no-cache', response.headers['Cache-Control'])
+            # Only the session, the user and the version stamps are read.
+            with self.assertNumQueries(3):
+                self.assertNotModified(url, response.headers['ETag'])
+
+    def test_label_changes_invalidate_pages(self):
+        etag = self.client.get(self.detail_url).headers['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_task.labels.add(self.label)
+        etag = self.assertModified(self.detail_url, etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_bulk_action(Task.objects.all(), 'remove_label', self.label)
+        etag = self.assertModified(self.detail_url, etag)
+        self.label.name = 'feature'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.label.save()
+        self.assertModified(self.detail_url, etag)
+
+    def test_etag_depends_on_filters_user_and_language(self):
+        etag = self.client.get(self.list_url).headers['ETag']
+        self.assertModified(self.list_url + '?own_tasks=on', etag)
+        self.assertModified(self.list_url, etag, HTTP_ACCEPT_LANGUAGE='en')
+        self.client.force_login(self.other_user)
+        self.assertModified(self.list_url, etag)
+
+    def test_pending_messages_render_the_page(self):
+        own_task = Task.objects.create(name='Own task', status=self.test_status,
+                                       creator=self.logged_user)
+        self.client.force_login(self.other_user)
+        etag = self.client.get(self.list_url).headers['ETag']
+        # Only the creator may delete, the refusal is a flash message.
+        self.client.get(reverse('task_delete', kwargs={'pk': own_task.pk}))
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['messages']), 1)
+        self.assertNotModified(self.list_url, etag)
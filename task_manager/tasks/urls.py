@@ -1,12 +1,23 @@
 from django.urls import path
 
+from task_manager.tasks.api import TaskApiListView, TaskApiDetailView
+from task_manager.tasks.export import TaskExportView
 from task_manager.tasks.views import TaskFilterView, TaskCreateView, \
-    TaskUpdateView, TaskDeleteView, TaskDetailView
+    TaskUpdateView, TaskDeleteView, TaskDetailView, TaskBulkActionView, \
+    TaskEventListView, TaskTimelineView
 
 urlpatterns = [
     path('', TaskFilterView.as_view(), name='tasks_list'),
     path('<int:pk>/', TaskDetailView.as_view(), name='task_detail'),
+    path('<int:pk>/history/', TaskTimelineView.as_view(),
+         name='task_history'),
+    path('activity/', TaskEventListView.as_view(), name='tasks_activity'),
     path('create/', TaskCreateView.as_view(), name='task_create'),
     path('<int:pk>/update/', TaskUpdateView.as_view(), name='task_update'),
     path('<int:pk>/delete/', TaskDeleteView.as_view(), name='task_delete'),
+    path('bulk/', TaskBulkActionView.as_view(), name='tasks_bulk'),
+    path('export/', TaskExportView.as_view(), name='tasks_export'),
+    path('api/', TaskApiListView.as_view(), name='tasks_api'),
+    path('api/<int:pk>/', TaskApiDetailView.as_view(),
+         name='task_api_detail'),
 ]
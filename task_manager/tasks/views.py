@@ -1,33 +1,150 @@
+from asgiref.sync import sync_to_async
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db import transaction
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext as _
-from django.views.generic import CreateView, UpdateView, \
-    DeleteView, DetailView
-from django_filters.views import FilterView
+from django.views import View
+from django.views.generic import CreateView, UpdateView, DeleteView
+from django_filters.views import FilterMixin
 
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.async_views import AsyncDetailView, AsyncListView
+from task_manager.mixins import AsyncLoginRequiredMixin, \
+    CustomLoginRequiredMixin, ProtectedDeleteMixin
+from task_manager.pagination import KeysetPaginationMixin
+from task_manager.tasks import events
 from task_manager.tasks.filters import TaskFilterSet
-from task_manager.tasks.models import Task
+from task_manager.tasks.bulk import apply_bulk_action
+from task_manager.tasks.forms import TaskBulkActionForm, TaskForm
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskEvent
 
 
-class TaskFilterView(CustomLoginRequiredMixin, FilterView):
+# Everything a task page shows.
+TASK_PAGE_MODELS = (Task, Status, Label, get_user_model())
+
+
+class TaskKeysetPaginationMixin(KeysetPaginationMixin):
+    def get_keyset_ordering(self, queryset):
+        if 'search_rank' in queryset.query.annotations:
+            return ('-search_rank', 'created_at', 'id')
+        return super().get_keyset_ordering(queryset)
+
+
+class TaskFilterView(AsyncLoginRequiredMixin, TaskKeysetPaginationMixin,
+                     FilterMixin, AsyncListView):
     model = Task
     template_name = 'tasks/list.html'
     context_object_name = 'tasks'
     filterset_class = TaskFilterSet
+    queryset = Task.objects.for_list()
+    version_models = TASK_PAGE_MODELS
 
+    def get_filtered_queryset(self):
+        # Form validation looks up the chosen rows with the sync ORM.
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        if not self.filterset.is_bound or self.filterset.is_valid() or \
+                not self.get_strict():
+            return self.filterset.qs
+        return self.filterset.queryset.none()
 
-class TaskDetailView(CustomLoginRequiredMixin, DetailView):
+    async def get_list_context(self):
+        queryset = await sync_to_async(self.get_filtered_queryset)()
+        paginator, page, tasks, is_paginated = \
+            await self.apaginate_queryset(
+                queryset, self.get_paginate_by(queryset)
+            )
+        return {
+            'filter': self.filterset,
+            'object_list': tasks,
+            'tasks': tasks,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'bulk_form': TaskBulkActionForm(),
+        }
+
+
+class TaskDetailView(AsyncLoginRequiredMixin, AsyncDetailView):
     model = Task
+    queryset = Task.objects.for_detail()
     template_name = 'tasks/detail.html'
+    version_models = TASK_PAGE_MODELS
+
+
+class TaskEventListView(AsyncLoginRequiredMixin, KeysetPaginationMixin,
+                        AsyncListView):
+    """Activity feed of all tasks, newest first, walking the primary key."""
+    model = TaskEvent
+    template_name = 'tasks/events.html'
+    context_object_name = 'events'
+    keyset_ordering = ('-id',)
+    # Events are only written along with task changes.
+    version_models = TASK_PAGE_MODELS
+
+    def get_queryset(self):
+        return TaskEvent.objects.select_related('actor')
+
+    async def get_list_context(self):
+        queryset = self.get_queryset()
+        paginator, page, task_events, is_paginated = \
+            await self.apaginate_queryset(
+                queryset, self.get_paginate_by(queryset)
+            )
+        await sync_to_async(events.describe)(task_events)
+        return {
+            'object_list': task_events,
+            'events': task_events,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+        }
+
+
+class TaskTimelineView(TaskEventListView):
+    """History of one task, served by the (task, id) index."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(task_id=self.kwargs['pk'])
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(task_id=self.kwargs['pk'], **kwargs)
+
+
+class TaskEventLogMixin:
+    """Log the change a TaskForm makes in the same transaction as the save.
 
+    The stored values are read before saving, by then the form has already
+    copied the new ones to ``self.object``.
+    """
 
-class TaskCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
+    def form_valid(self, form):
+        with transaction.atomic():
+            before = self.object and events.stored_values(self.object.pk)
+            response = super().form_valid(form)
+            label_ids = [label.pk for label in form.cleaned_data['labels']]
+            if before is None:
+                event = events.created(self.object, label_ids,
+                                       self.request.user)
+            else:
+                event = events.updated(
+                    self.object.pk, before,
+                    events.task_values(self.object, label_ids),
+                    self.request.user,
+                )
+            if event is not None:
+                events.save([event])
+        return response
+
+
+class TaskCreateView(CustomLoginRequiredMixin, TaskEventLogMixin,
+                     SuccessMessageMixin, CreateView):
     model = Task
     template_name = 'tasks/create.html'
-    fields = ['name', 'description', 'status', 'executor', 'labels']
+    form_class = TaskForm
     success_url = reverse_lazy('tasks_list')
     success_message = _('The task has been created')
 
@@ -36,15 +153,17 @@ class TaskCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
         return super().form_valid(form)
 
 
-class TaskUpdateView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class TaskUpdateView(CustomLoginRequiredMixin, TaskEventLogMixin,
+                     SuccessMessageMixin, UpdateView):
     model = Task
-    fields = ['name', 'description', 'status', 'executor', 'labels']
+    form_class = TaskForm
     template_name = 'tasks/update.html'
     success_url = reverse_lazy('tasks_list')
     success_message = _('The task has been successfully changed')
 
 
-class TaskDeleteView(CustomLoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class TaskDeleteView(CustomLoginRequiredMixin, ProtectedDeleteMixin,
+                     SuccessMessageMixin, DeleteView):
     model = Task
     template_name = 'tasks/delete.html'
     success_url = reverse_lazy('tasks_list')
@@ -67,3 +186,53 @@ class TaskDeleteView(CustomLoginRequiredMixin, SuccessMessageMixin, DeleteView):
         if not self.check_task_creator():
             return redirect('tasks_list')
         return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        event = events.deleted(self.object, self.request.user)
+        with transaction.atomic():
+            response = super().form_valid(form)
+            # The primary key is cleared only if the task was deleted.
+            if self.object.pk is None:
+                events.save([event])
+        return response
+
+
+class TaskBulkActionView(CustomLoginRequiredMixin, View):
+    def get_success_url(self):
+        url = reverse('tasks_list')
+        return f'{url}?{self.request.GET.urlencode()}' if self.request.GET \
+            else url
+
+    def get_selected_tasks(self, form):
+        if form.cleaned_data['select_all']:
+            filterset = TaskFilterSet(self.request.GET,
+                                      queryset=Task.objects.all(),
+                                      request=self.request)
+            return filterset.qs if filterset.is_valid() else None
+        task_ids = self.request.POST.getlist('tasks')
+        if not task_ids or not all(pk.isdigit() for pk in task_ids):
+            return None
+        return Task.objects.filter(pk__in=task_ids)
+
+    def exclude_foreign_tasks(self, tasks):
+        if tasks.exclude(creator=self.request.user).exists():
+            messages.error(
+                self.request,
+                _('Only the author of the task can delete it'))
+        return tasks.filter(creator=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        form = TaskBulkActionForm(request.POST)
+        tasks = self.get_selected_tasks(form) if form.is_valid() else None
+        if tasks is None:
+            messages.error(request, _('Select tasks and an action'))
+            return redirect(self.get_success_url())
+
+        action = form.cleaned_data['action']
+        if action == 'delete':
+            tasks = self.exclude_foreign_tasks(tasks)
+        count = apply_bulk_action(tasks, action, form.action_value,
+                                  actor=request.user)
+        messages.success(
+            request, _('Tasks changed: %(count)d') % {'count': count})
+        return redirect(self.get_success_url())
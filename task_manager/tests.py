@@ -1,7 +1,26 @@
+import gc
+import json
+import os
+import runpy
+import threading
+import time
+import traceback
+import weakref
+from unittest import mock
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import OperationalError, connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 
+from task_manager import reporting
+
+from task_manager.postgresql_pool.pool import ConnectionPool, PoolTimeout
+from task_manager.routers import PrimaryReplicaRouter, Routing, routing
+from task_manager.statuses.models import Status
+from task_manager.views import IndexTemplateView
+
 
 class SetUpLoggedUserMixin:
     @classmethod
@@ -33,6 +52,50 @@ class TestIndexTemplateView(SetUpLoggedUserMixin, TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class TestHealthCheckView(TestCase):
+    def test_health_check(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('health'))
+        self.assertEqual(response.json(), {'status': 'ok'})
+        self.assertIn('no-cache', response.headers['Cache-Control'])
+
+    def test_health_check_database_down(self):
+        with mock.patch.object(connection, 'cursor',
+                               side_effect=OperationalError):
+            response = self.client.get(reverse('health'))
+        self.assertEqual(response.status_code, 503)
+
+
+class TestGunicornConfig(SimpleTestCase):
+    def load(self, **env):
+        with mock.patch.dict(os.environ, env):
+            return runpy.run_path(settings.BASE_DIR / 'gunicorn.conf.py')
+
+    def test_defaults(self):
+        config = self.load()
+        self.assertGreaterEqual(config['workers'], 3)
+        self.assertTrue(config['preload_app'])
+        self.assertGreater(config['max_requests_jitter'], 0)
+
+    def test_env_overrides(self):
+        config = self.load(WEB_CONCURRENCY='2', GUNICORN_WORKER_CLASS='gthread')
+        self.assertEqual(config['workers'], 2)
+        self.assertEqual(config['worker_class'], 'gthread')
+
+
+class TestAsgiApplication(SimpleTestCase):
+    def load(self, **env):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('CONN_MAX_AGE', None)
+            os.environ.update(env)
+            runpy.run_path(settings.BASE_DIR / 'task_manager' / 'asgi.py')
+            return os.environ['CONN_MAX_AGE']
+
+    def test_connections_are_not_persistent_by_default(self):
+        self.assertEqual(self.load(), '0')
+        self.assertEqual(self.load(CONN_MAX_AGE='60'), '60')
+
+
 class TestUserLoginView(SetUpLoggedUserMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -69,3 +132,338 @@ class TestNotFoundedPage(TestCase):
     def test_not_founded_page(self):
         response = self.client.get('/not-founded-page/')
         self.assertEqual(response.status_code, 404)
+
+
+@override_settings(REQUEST_INSTRUMENTATION=True,
+                   REQUEST_INSTRUMENTATION_SAMPLE_RATE=1.0)
+class TestRequestInstrumentationMiddleware(SetUpLoggedUserMixin, TestCase):
+    def test_server_timing_header_and_log(self):
+        with self.assertLogs('task_manager.performance', 'INFO') as logs:
+            response = self.client.get(reverse('statuses_list'))
+
+        self.assertIn('db;dur=', response.headers['Server-Timing'])
+        self.assertIn('render;dur=', response.headers['Server-Timing'])
+        metrics = json.loads(logs.records[0].getMessage())
+        self.assertEqual(metrics['path'], reverse('statuses_list'))
+        self.assertGreater(metrics['queries'], 0)
+        self.assertGreater(metrics['render_ms'], 0)
+
+    async def test_async_request(self):
+        await self.async_client.aforce_login(self.logged_user)
+        with self.assertLogs('task_manager.performance', 'INFO') as logs:
+            response = await self.async_client.get(reverse('statuses_list'))
+
+        self.assertIn('db;dur=', response.headers['Server-Timing'])
+        metrics = json.loads(logs.records[0].getMessage())
+        self.assertGreater(metrics['queries'], 0)
+
+    @override_settings(REQUEST_INSTRUMENTATION_DUPLICATE_THRESHOLD=1)
+    def test_repeated_queries_are_reported(self):
+        with self.assertLogs('task_manager.performance', 'INFO') as logs:
+            self.client.get(reverse('statuses_list'))
+
+        metrics = json.loads(logs.records[0].getMessage())
+        self.assertEqual(sum(metrics['duplicates'].values()), metrics['queries'])
+
+    def test_pool_metrics(self):
+        stats = {'size': 2, 'idle': 1, 'checked_out': 1, 'waiting': 0,
+                 'wait_ms': 0.0, 'timeouts': 0}
+        with mock.patch('task_manager.middleware.pool_stats',
+                        return_value={'default': stats}), \
+                self.assertLogs('task_manager.performance', 'INFO') as logs:
+            response = self.client.get(reverse('index'))
+
+        self.assertIn('pool-default;dur=0.0;desc="1 checked out, 0 waiting"',
+                      response.headers['Server-Timing'])
+        metrics = json.loads(logs.records[0].getMessage())
+        self.assertEqual(metrics['pools'], {'default': stats})
+
+    @override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=0.0)
+    def test_not_sampled_request(self):
+        response = self.client.get(reverse('index'))
+        self.assertNotIn('Server-Timing', response.headers)
+
+    @override_settings(REQUEST_INSTRUMENTATION=False)
+    def test_disabled(self):
+        response = self.client.get(reverse('index'))
+        self.assertNotIn('Server-Timing', response.headers)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def usable(connection):
+    return not connection.closed
+
+
+class TestConnectionPool(SimpleTestCase):
+    def test_connection_is_reused(self):
+        pool = ConnectionPool(max_size=2)
+        first, waited = pool.getconn(FakeConnection, usable)
+        pool.putconn(first, usable)
+        second, waited = pool.getconn(FakeConnection, usable)
+
+        self.assertIs(first, second)
+        self.assertEqual(pool.stats()['size'], 1)
+        self.assertEqual(pool.stats()['checked_out'], 1)
+
+    def test_timeout_when_exhausted(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.getconn(FakeConnection, usable)
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn(FakeConnection, usable)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_waiting_thread_gets_returned_connection(self):
+        pool = ConnectionPool(max_size=1, timeout=5)
+        connection, waited = pool.getconn(FakeConnection, usable)
+        timer = threading.Timer(0.05, pool.putconn, (connection, usable))
+        timer.start()
+        reused, waited = pool.getconn(FakeConnection, usable)
+        timer.join()
+
+        self.assertIs(reused, connection)
+        self.assertGreater(waited, 0)
+        self.assertGreater(pool.stats()['wait_ms'], 0)
+
+    def test_broken_connection_is_discarded(self):
+        pool = ConnectionPool(max_size=1)
+        connection, waited = pool.getconn(FakeConnection, usable)
+        pool.putconn(connection, lambda connection: False)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_stale_idle_connection_is_checked(self):
+        pool = ConnectionPool(max_size=1, check_after=0)
+        stale, waited = pool.getconn(FakeConnection, usable)
+        pool.putconn(stale, usable)
+
+        fresh, waited = pool.getconn(FakeConnection, lambda connection: False)
+        self.assertIsNot(fresh, stale)
+        self.assertTrue(stale.closed)
+        self.assertEqual(pool.stats()['size'], 1)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class TestPrimaryReplicaRouter(SimpleTestCase):
+    router = PrimaryReplicaRouter()
+
+    def route_read(self, state):
+        token = routing.set(state)
+        try:
+            return self.router.db_for_read(Status)
+        finally:
+            routing.reset(token)
+
+    def test_read_only_view_reads_from_replica(self):
+        state = Routing()
+        state.use_replica = True
+        self.assertEqual(self.route_read(state), 'replica_0')
+
+    def test_primary_outside_read_only_views(self):
+        self.assertEqual(self.route_read(None), 'default')
+        self.assertEqual(self.route_read(Routing()), 'default')
+
+    def test_primary_when_pinned(self):
+        state = Routing(pinned=True)
+        state.use_replica = True
+        self.assertEqual(self.route_read(state), 'default')
+
+    def test_primary_after_write(self):
+        state = Routing()
+        state.use_replica = True
+        token = routing.set(state)
+        try:
+            self.assertEqual(self.router.db_for_write(Status), 'default')
+        finally:
+            routing.reset(token)
+        self.assertTrue(state.wrote)
+        self.assertEqual(self.route_read(state), 'default')
+
+    def test_no_migrations_on_replicas(self):
+        self.assertTrue(self.router.allow_migrate('default', 'statuses'))
+        self.assertFalse(self.router.allow_migrate('replica_0', 'statuses'))
+
+
+# The primary stands in for the replica, random.choice shows replica reads.
+@override_settings(DATABASE_REPLICAS=['default'])
+class TestReplicaRoutingMiddleware(SetUpLoggedUserMixin, TestCase):
+    def get(self, url):
+        with mock.patch('task_manager.routers.random.choice',
+                        return_value='default') as choice:
+            response = self.client.get(url)
+        return response, choice.called
+
+    def test_list_reads_from_replica(self):
+        response, replica = self.get(reverse('statuses_list'))
+        self.assertTrue(replica)
+        self.assertNotIn('primary_pin', response.cookies)
+
+    async def test_async_list_reads_from_replica(self):
+        await self.async_client.aforce_login(self.logged_user)
+        with mock.patch('task_manager.routers.random.choice',
+                        return_value='default') as choice:
+            await self.async_client.get(reverse('statuses_list'))
+        self.assertTrue(choice.called)
+
+    def test_other_views_read_from_primary(self):
+        response, replica = self.get(reverse('status_create'))
+        self.assertFalse(replica)
+
+    def test_write_pins_client_to_primary(self):
+        response = self.client.post(reverse('status_create'),
+                                    {'name': 'Pinned'})
+        self.assertEqual(response.cookies['primary_pin']['max-age'],
+                         settings.REPLICA_PIN_SECONDS)
+
+        response, replica = self.get(reverse('statuses_list'))
+        self.assertFalse(replica)
+        self.assertContains(response, 'Pinned')
+
+
+sink_released = threading.Event()
+sent_batches = []
+
+
+class Marker:
+    pass
+
+
+def hanging_sink(reports):
+    sink_released.wait()
+
+
+def recording_sink(reports):
+    sent_batches.append(reports)
+
+
+def error_reporting(sink, **options):
+    return override_settings(ERROR_REPORTING={
+        **settings.ERROR_REPORTING,
+        'SINK': f'task_manager.tests.{sink}',
+        'SHUTDOWN_TIMEOUT': 0,
+        **options,
+    })
+
+
+class TestReportQueue(SimpleTestCase):
+    def setUp(self):
+        sink_released.clear()
+        sent_batches.clear()
+        self.addCleanup(sink_released.set)
+
+    def test_full_queue_drops_the_oldest_reports(self):
+        queue = reporting.ReportQueue(hanging_sink, max_size=3, batch_size=1,
+                                      flush_interval=0)
+        queue.put(0)
+        # The thread is now stuck sending the first report.
+        self.assertFalse(queue.flush(timeout=0.1))
+        for report in range(1, 6):
+            queue.put(report)
+        self.assertEqual(list(queue.reports), [3, 4, 5])
+        self.assertEqual(queue.stats(), {'size': 3, 'queued': 6, 'sent': 0,
+                                         'failed': 0, 'dropped': 2})
+
+        with self.assertLogs('task_manager.performance', 'WARNING') as logs:
+            sink_released.set()
+            self.assertTrue(queue.flush(timeout=1))
+        self.assertIn('Dropped 2 error reports', logs.output[0])
+        self.assertEqual(queue.stats()['sent'], 6 - 2)
+
+    def test_reports_are_sent_in_batches(self):
+        queue = reporting.ReportQueue(recording_sink, batch_size=4,
+                                      flush_interval=0.05)
+        for report in range(10):
+            queue.put(report)
+        self.assertTrue(queue.flush(timeout=1))
+        self.assertEqual(sum(sent_batches, []), list(range(10)))
+        self.assertLessEqual(max(map(len, sent_batches)), 4)
+
+        queue.sink = mock.Mock(side_effect=OSError)
+        with self.assertLogs('task_manager.performance', 'ERROR'):
+            queue.put(10)
+            self.assertTrue(queue.flush(timeout=1))
+        self.assertEqual(queue.stats()['failed'], 1)
+
+    @override_settings(ROLLBAR={'access_token': 'token',
+                                'environment': 'test'})
+    def test_rollbar_sink(self):
+        reporting.init_rollbar.cache_clear()
+        self.addCleanup(reporting.init_rollbar.cache_clear)
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError as error:
+            exception = traceback.TracebackException.from_exception(error)
+        with mock.patch('task_manager.reporting.rollbar') as rollbar:
+            reporting.rollbar_sink([
+                {'exception': exception, 'request': None},
+                {'message': 'Slow', 'request': {'url': '/'}, 'extra': {}},
+            ])
+        rollbar.init.assert_called_once_with('token', 'test',
+                                             handler='blocking')
+        self.assertEqual(rollbar.report_message.call_args_list, [
+            mock.call(''.join(exception.format()), 'error', payload_data={
+                'title': 'RuntimeError: boom',
+                'fingerprint': mock.ANY,
+            }),
+            mock.call('Slow', 'warning', extra_data={},
+                      payload_data={'request': {'url': '/'}}),
+        ])
+
+
+class TestErrorReportingMiddleware(SetUpLoggedUserMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        sink_released.clear()
+        sent_batches.clear()
+        self.addCleanup(sink_released.set)
+
+    def get_index(self):
+        client = Client(raise_request_exception=False)
+        client.force_login(self.logged_user)
+        return client.get(reverse('index'))
+
+    @error_reporting('hanging_sink', FLUSH_INTERVAL=0)
+    def test_failing_request_does_not_wait_for_the_sink(self):
+        with mock.patch.object(IndexTemplateView, 'get',
+                               side_effect=RuntimeError('boom')):
+            for _ in range(3):
+                started = time.perf_counter()
+                response = self.get_index()
+                self.assertEqual(response.status_code, 500)
+                self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(reporting.get_queue().stats()['queued'], 3)
+
+    @error_reporting('hanging_sink', FLUSH_INTERVAL=0)
+    def test_queued_errors_do_not_keep_frames_alive(self):
+        locals_refs = []
+
+        def get(*args, **kwargs):
+            request_locals = Marker()
+            locals_refs.append(weakref.ref(request_locals))
+            raise RuntimeError('boom')
+
+        with mock.patch.object(IndexTemplateView, 'get', get):
+            self.get_index()
+        gc.collect()
+        self.assertEqual(reporting.get_queue().stats()['queued'], 1)
+        self.assertIsNone(locals_refs[0]())
+
+    @error_reporting('recording_sink', FLUSH_INTERVAL=0, SLOW_REQUEST_MS=0.001)
+    def test_errors_and_slow_requests_are_reported(self):
+        with mock.patch.object(IndexTemplateView, 'get',
+                               side_effect=RuntimeError('boom')):
+            self.get_index()
+        self.assertTrue(reporting.get_queue().flush(timeout=1))
+        error, slow = sum(sent_batches, [])
+        self.assertIs(error['exception'].exc_type, RuntimeError)
+        self.assertEqual(error['request']['url'], reverse('index'))
+        self.assertNotIn('Cookie', error['request']['headers'])
+        self.assertEqual(slow['extra']['status'], 500)
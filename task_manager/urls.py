@@ -1,11 +1,13 @@
 from django.contrib import admin
 from django.urls import path, include
 
-from task_manager.views import IndexTemplateView, UserLoginView, UserLogoutView
+from task_manager.views import HealthCheckView, IndexTemplateView, \
+    UserLoginView, UserLogoutView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', IndexTemplateView.as_view(), name='index'),
+    path('health/', HealthCheckView.as_view(), name='health'),
     path('login/', UserLoginView.as_view(), name='login'),
     path('logout/', UserLogoutView.as_view(), name='logout'),
     path('users/', include('task_manager.users.urls')),
@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+
+from task_manager.api import ApiDetailView, ApiField, ApiListView
+
+
+class UserApiMixin:
+    model = get_user_model()
+    keyset_ordering = ('date_joined', 'id')
+    api_fields = {
+        'id': ApiField('id'),
+        'username': ApiField('username'),
+        'first_name': ApiField('first_name'),
+        'last_name': ApiField('last_name'),
+        'date_joined': ApiField('date_joined'),
+    }
+
+
+class UserApiListView(UserApiMixin, ApiListView):
+    pass
+
+
+class UserApiDetailView(UserApiMixin, ApiDetailView):
+    pass
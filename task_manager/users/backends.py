@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+
+def user_cache_key(user_id):
+    return f'auth.user.{user_id}'
+
+
+def forget_user(user_id):
+    caches[settings.USER_CACHE_ALIAS].delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend that keeps the session user in the cache.
+
+    ``get_user`` runs on every authenticated request, the cached copy is
+    dropped on logout and whenever the user is saved or deleted.
+    """
+
+    def get_user(self, user_id):
+        cache = caches[settings.USER_CACHE_ALIAS]
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
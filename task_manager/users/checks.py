@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core import checks
+
+CACHED_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+CACHED_BACKEND = 'task_manager.users.backends.CachedModelBackend'
+PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared(alias):
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_CACHES
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """Cached sessions and users are only dropped in the process that
+    changed them, the other workers keep serving the stale copy.
+    """
+    errors = []
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES \
+            and not is_shared(settings.SESSION_CACHE_ALIAS):
+        errors.append(checks.Warning(
+            f'SESSION_ENGINE {settings.SESSION_ENGINE!r} uses the '
+            f'per-process cache {settings.SESSION_CACHE_ALIAS!r}.',
+            hint='Point SESSION_CACHE_ALIAS at a shared cache such as Redis '
+                 'or Memcached, or set SESSION_BACKEND=db.',
+            id='users.W001',
+        ))
+    if CACHED_BACKEND in settings.AUTHENTICATION_BACKENDS \
+            and not is_shared(settings.USER_CACHE_ALIAS):
+        errors.append(checks.Warning(
+            f'Logged in users are cached in the per-process cache '
+            f'{settings.USER_CACHE_ALIAS!r}.',
+            hint='Point USER_CACHE_ALIAS at a shared cache such as Redis or '
+                 'Memcached, or unset USER_CACHE.',
+            id='users.W002',
+        ))
+    return errors
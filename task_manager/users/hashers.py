@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def cost(profile, name):
+    """Read a cost parameter from PASSWORD_HASHER_PARAMS when it's used."""
+    return property(
+        lambda self: settings.PASSWORD_HASHER_PARAMS[profile][name]
+    )
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = cost('pbkdf2', 'iterations')
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    work_factor = cost('scrypt', 'work_factor')
+    block_size = cost('scrypt', 'block_size')
+    parallelism = cost('scrypt', 'parallelism')
+
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * n * r bytes, OpenSSL refuses more than 32 MiB
+        # unless told otherwise. Leave room to verify hashes made with up
+        # to twice the current cost.
+        return 2 * 128 * self.work_factor * self.block_size * \
+            self.parallelism + 2**20
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    time_cost = cost('argon2', 'time_cost')
+    memory_cost = cost('argon2', 'memory_cost')
+    parallelism = cost('argon2', 'parallelism')
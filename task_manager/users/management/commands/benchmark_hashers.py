@@ -0,0 +1,62 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+# The parameter the hashing time grows linearly with.
+SCALED_PARAMS = {
+    'pbkdf2': 'iterations',
+    'scrypt': 'work_factor',
+    'argon2': 'time_cost',
+}
+
+
+def scale(name, value, ratio):
+    if name == 'scrypt':
+        # The work factor must stay a power of two.
+        return 2 ** max(1, int(value * ratio).bit_length() - 1)
+    if name == 'pbkdf2':
+        return max(1000, int(round(value * ratio, -3)))
+    return max(1, int(value * ratio))
+
+
+class Command(BaseCommand):
+    help = ('Time one password hash for every hasher profile with the cost '
+            'set in PASSWORD_HASHER_PARAMS.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=5)
+        parser.add_argument(
+            '--budget-ms', type=float,
+            help='Suggest the cost that takes this long per hash.',
+        )
+
+    def handle(self, *args, **options):
+        for name, path in settings.PASSWORD_HASHER_CLASSES.items():
+            hasher = import_string(path)()
+            params = settings.PASSWORD_HASHER_PARAMS[name]
+            described = ' '.join(f'{key}={value}'
+                                 for key, value in params.items())
+            try:
+                median = self.measure(hasher, options['rounds'])
+            except ValueError as error:
+                self.stdout.write(f'{name} {described}: skipped, {error}')
+                continue
+            line = (f'{name} {described}: {median:.1f} ms per hash, '
+                    f'{1000 / median:.1f} hashes/s per worker')
+            if options['budget_ms']:
+                param = SCALED_PARAMS[name]
+                suggested = scale(name, params[param],
+                                  options['budget_ms'] / median)
+                line += f', {param}={suggested} fits the budget'
+            self.stdout.write(line)
+
+    def measure(self, hasher, rounds):
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            hasher.encode('benchmark-password', hasher.salt())
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 05:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Profile',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('created_tasks_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='number of created tasks')),
+                ('assigned_tasks_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='number of assigned tasks')),
+            ],
+            options={
+                'verbose_name': 'Profile',
+                'verbose_name_plural': 'Profiles',
+            },
+        ),
+    ]
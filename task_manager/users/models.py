@@ -1,4 +1,7 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import models
+from django.utils.translation import gettext_lazy as _
 
 
 def get_full_name(self):
@@ -6,3 +9,23 @@ def get_full_name(self):
 
 
 get_user_model().add_to_class('__str__', get_full_name)
+
+
+class Profile(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='profile',
+    )
+    # Maintained by task_manager.tasks.counters.
+    created_tasks_count = models.PositiveIntegerField(
+        _('number of created tasks'), default=0, editable=False
+    )
+    assigned_tasks_count = models.PositiveIntegerField(
+        _('number of assigned tasks'), default=0, editable=False
+    )
+
+    class Meta:
+        verbose_name = _('Profile')
+        verbose_name_plural = _('Profiles')
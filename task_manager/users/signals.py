@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from task_manager.users.backends import forget_user
+from task_manager.users.models import Profile
+
+
+def create_profile(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Profile.objects.get_or_create(user=instance)
+
+
+def forget_cached_user(sender, instance=None, user=None, **kwargs):
+    user = instance or user
+    if user is not None and user.pk is not None:
+        # A request reading the user before the commit would cache the old
+        # row again.
+        user_id = user.pk
+        transaction.on_commit(lambda: forget_user(user_id))
+
+
+post_save.connect(create_profile, sender=get_user_model())
+post_save.connect(forget_cached_user, sender=get_user_model())
+post_delete.connect(forget_cached_user, sender=get_user_model())
+user_logged_out.connect(forget_cached_user)
@@ -1,12 +1,18 @@
+from io import StringIO
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.core.cache import caches
+from django.core.checks import run_checks
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 
 from task_manager.statuses.models import Status
 from task_manager.tasks.models import Task
 from task_manager.tests import SetUpLoggedUserMixin
+from task_manager.users.backends import user_cache_key
 
 
 class TestUserListView(SetUpLoggedUserMixin, TestCase):
@@ -19,6 +25,10 @@ class TestUserListView(SetUpLoggedUserMixin, TestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
+    async def test_user_list_view_async_client(self):
+        response = await self.async_client.get(self.url)
+        self.assertContains(response, self.logged_user.username)
+
     def test_user_list_view_get_not_logged_in(self):
         self.client.logout()
         response = self.client.get(self.url)
@@ -159,6 +169,17 @@ class TestUserDelete(SetUpLoggedUserMixin, TestCase):
             'User should not be deleted if he is associated with task as executor'
         )
 
+    def test_user_delete_view_post_self_user_created_task_queries(self):
+        Task.objects.create(
+            name='Test task', creator=self.other_user,
+            executor=self.logged_user,
+            status=Status.objects.create(name='Test status'),
+        )
+        self.client.get(reverse('user_list'))
+        # The session and the user, then the user to delete.
+        with self.assertNumQueries(3):
+            self.client.post(self.url_self)
+
     def test_user_delete_view_post_other_user(self):
         response = self.client.post(self.url_other)
         self.assertRedirects(response, reverse('user_list'))
@@ -179,3 +200,154 @@ class TestUserDelete(SetUpLoggedUserMixin, TestCase):
         self.assertRedirects(response, settings.LOGIN_URL)
 
         self.assertTrue(get_user_model().objects.filter(pk=self.logged_user.pk).exists())
+
+
+class TestUserApiViews(SetUpLoggedUserMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('users_api')
+
+    def test_user_api_list(self):
+        response = self.client.get(self.url, {'fields': 'username'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn({'username': self.logged_user.username}, response.json()['results'])
+
+    def test_user_api_detail(self):
+        url = reverse('user_api_detail', kwargs={'pk': self.logged_user.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.json()['username'], self.logged_user.username)
+
+    def test_user_api_not_modified(self):
+        etag = self.client.get(self.url).headers['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            get_user_model().objects.create(username='other_user')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+    AUTHENTICATION_BACKENDS=['task_manager.users.backends.CachedModelBackend'],
+)
+class TestCachedAuthentication(SetUpLoggedUserMixin, TestCase):
+    def setUp(self):
+        # Rolling back a test leaves its cached users behind.
+        caches[settings.USER_CACHE_ALIAS].clear()
+        super().setUp()
+
+    def cached_user(self):
+        return caches[settings.USER_CACHE_ALIAS].get(
+            user_cache_key(self.logged_user.pk)
+        )
+
+    def test_warm_page_view_runs_no_auth_queries(self):
+        self.client.get(reverse('index'))
+        self.assertEqual(self.cached_user(), self.logged_user)
+
+        # Only the dashboard is read from the database.
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('index'))
+        self.assertEqual(response.context['user'], self.logged_user)
+
+    def test_user_update_forgets_cached_user(self):
+        self.client.get(reverse('index'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('user_update', kwargs={'pk': self.logged_user.pk}),
+                {'username': 'isaac_newton', 'password1': 'newpass1234',
+                 'password2': 'newpass1234'},
+            )
+
+        self.assertIsNone(self.cached_user())
+        response = self.client.get(reverse('index'))
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_user_delete_forgets_cached_user(self):
+        self.client.get(reverse('index'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('user_delete', kwargs={'pk': self.logged_user.pk})
+            )
+
+        self.assertIsNone(self.cached_user())
+
+    def test_logout_forgets_cached_user(self):
+        self.client.get(reverse('index'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('logout'))
+
+        self.assertIsNone(self.cached_user())
+
+    def test_user_is_forgotten_after_commit(self):
+        self.client.get(reverse('index'))
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.logged_user.save()
+            self.assertEqual(self.cached_user(), self.logged_user)
+        callbacks[0]()
+        self.assertIsNone(self.cached_user())
+
+    def test_per_process_cache_is_reported(self):
+        self.assertEqual(
+            {warning.id for warning in run_checks(tags=['caches'])},
+            {'users.W001', 'users.W002'},
+        )
+        with override_settings(CACHES={
+            **settings.CACHES,
+            'default': {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            },
+        }):
+            self.assertEqual(run_checks(tags=['caches']), [])
+
+
+FAST_HASHER_PARAMS = {
+    'pbkdf2': {'iterations': 1000},
+    'scrypt': {'work_factor': 2**10, 'block_size': 8, 'parallelism': 1},
+    'argon2': {'time_cost': 1, 'memory_cost': 1024, 'parallelism': 1},
+}
+
+
+@override_settings(PASSWORD_HASHER_PARAMS=FAST_HASHER_PARAMS)
+class TestPasswordHashers(TestCase):
+    password = 'qwer1234qwer1234'
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='albert_einstein', password=self.password
+        )
+
+    def login(self):
+        self.client.post(reverse('login'), {'username': self.user.username,
+                                            'password': self.password})
+        self.user.refresh_from_db()
+
+    def test_new_password_uses_configured_cost(self):
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_login_rehashes_with_new_cost(self):
+        params = {**FAST_HASHER_PARAMS, 'pbkdf2': {'iterations': 2000}}
+        with self.settings(PASSWORD_HASHER_PARAMS=params):
+            self.login()
+
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(self.user.check_password(self.password))
+
+    def test_login_rehashes_with_new_algorithm(self):
+        hashers = settings.PASSWORD_HASHER_CLASSES
+        with self.settings(PASSWORD_HASHERS=[hashers['scrypt'],
+                                             hashers['pbkdf2']]):
+            self.login()
+            self.assertTrue(self.user.password.startswith('scrypt$1024$'))
+            self.assertTrue(self.user.check_password(self.password))
+
+    def test_benchmark_hashers(self):
+        out = StringIO()
+        call_command('benchmark_hashers', rounds=1, budget_ms=10, stdout=out)
+
+        self.assertIn('pbkdf2 iterations=1000:', out.getvalue())
+        self.assertIn('scrypt work_factor=1024', out.getvalue())
+        self.assertIn('fits the budget', out.getvalue())
@@ -1,4 +1,5 @@
 from django.urls import path
+from .api import UserApiListView, UserApiDetailView
 from .views import UserListView, UserDeleteView, UserCreateView, UserUpdateView
 
 urlpatterns = [
@@ -6,4 +7,7 @@ urlpatterns = [
     path('create/', UserCreateView.as_view(), name='user_create'),
     path('<int:pk>/update/', UserUpdateView.as_view(), name='user_update'),
     path('<int:pk>/delete/', UserDeleteView.as_view(), name='user_delete'),
+    path('api/', UserApiListView.as_view(), name='users_api'),
+    path('api/<int:pk>/', UserApiDetailView.as_view(),
+         name='user_api_detail'),
 ]
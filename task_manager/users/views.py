@@ -5,9 +5,12 @@ from django.contrib.messages.views import SuccessMessageMixin
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext as _
-from django.views.generic import ListView, DeleteView, CreateView, UpdateView
+from django.views.generic import DeleteView, CreateView, UpdateView
 
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.async_views import AsyncListView
+from task_manager.mixins import CustomLoginRequiredMixin, \
+    ProtectedDeleteMixin
+from task_manager.tasks.models import Task
 from task_manager.users.forms import CustomUserCreationForm
 
 
@@ -25,10 +28,15 @@ class LoginRequiredAndUserSelfCheckMixin(CustomLoginRequiredMixin, UserPassesTes
             return redirect('user_list')
 
 
-class UserListView(ListView):
+class UserListView(AsyncListView):
     model = get_user_model()
     template_name = 'users/list.html'
     context_object_name = 'users'
+    # Tasks change the counts shown.
+    version_models = (get_user_model(), Task)
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('profile')
 
 
 class UserCreateView(SuccessMessageMixin, CreateView):
@@ -47,18 +55,17 @@ class UserUpdateView(LoginRequiredAndUserSelfCheckMixin, SuccessMessageMixin,
     success_message = _('User successfully updated')
 
 
-class UserDeleteView(LoginRequiredAndUserSelfCheckMixin, SuccessMessageMixin,
-                     DeleteView):
+class UserDeleteView(LoginRequiredAndUserSelfCheckMixin, ProtectedDeleteMixin,
+                     SuccessMessageMixin, DeleteView):
     model = get_user_model()
     template_name = 'users/delete.html'
     success_url = reverse_lazy('user_list')
     success_message = _('User successfully deleted')
+    protected_message = _('Unable to delete a user because it is being used')
+    protected_url = reverse_lazy('user_list')
+    protected_counters = (
+        'profile__created_tasks_count', 'profile__assigned_tasks_count',
+    )
 
-    def post(self, request, *args, **kwargs):
-        if self.get_object().created_tasks.exists() or \
-                self.get_object().assigned_tasks.exists():
-            messages.error(
-                self.request,
-                _('Unable to delete a user because it is being used'))
-            return redirect('user_list')
-        return super().post(request, *args, **kwargs)
+    def get_queryset(self):
+        return super().get_queryset().select_related('profile')
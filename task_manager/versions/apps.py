@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class VersionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'task_manager.versions'
+
+    def ready(self):
+        from task_manager.versions import signals  # noqa: F401
@@ -0,0 +1,23 @@
+import hashlib
+
+from django.middleware.csrf import get_token
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+
+
+def version_etag(request, versions):
+    """ETag of a page built from ``versions`` for the requesting user.
+
+    The path carries the filter and page parameters, the CSRF secret keeps
+    a page with stale form tokens from being reused after a new login.
+    """
+    # Creates the secret on a first visit, the page would render with it.
+    get_token(request)
+    key = '|'.join([
+        repr(versions),
+        str(request.user.pk),
+        request.get_full_path(),
+        get_language() or '',
+        request.META.get('CSRF_COOKIE', ''),
+    ])
+    return quote_etag(hashlib.sha1(key.encode()).hexdigest())
@@ -0,0 +1,57 @@
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class ModelVersionManager(models.Manager):
+    def bump(self, model):
+        label = model._meta.label_lower
+        now = timezone.now()
+        updated = self.filter(pk=label).update(
+            version=F('version') + 1, changed_at=now
+        )
+        if not updated:
+            self.get_or_create(
+                pk=label, defaults={'version': 1, 'changed_at': now}
+            )
+
+    def stamp(self, *models_):
+        """Versions of the given models and the time of the latest change."""
+        labels = [model._meta.label_lower for model in models_]
+        return self._stamp(labels, self.filter(pk__in=labels))
+
+    async def astamp(self, *models_):
+        labels = [model._meta.label_lower for model in models_]
+        rows = [row async for row in self.filter(pk__in=labels)]
+        return self._stamp(labels, rows)
+
+    def _stamp(self, labels, rows):
+        rows = {row.pk: row for row in rows}
+        versions = tuple(
+            rows[label].version if label in rows else 0 for label in labels
+        )
+        changed = [row.changed_at for row in rows.values()]
+        return versions, max(changed) if changed else None
+
+    def cache_key(self, *models_):
+        """A string that changes whenever any of the models changes."""
+        return self._cache_key(*self.stamp(*models_))
+
+    async def acache_key(self, *models_):
+        return self._cache_key(*await self.astamp(*models_))
+
+    @staticmethod
+    def _cache_key(versions, changed_at):
+        timestamp = changed_at.timestamp() if changed_at else 0
+        return '.'.join(map(str, versions)) + f'@{timestamp}'
+
+
+class ModelVersion(models.Model):
+    model = models.CharField(max_length=128, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    objects = ModelVersionManager()
+
+    def __str__(self):
+        return f'{self.model} v{self.version}'
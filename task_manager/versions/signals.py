@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.versions.models import ModelVersion
+
+# Saves touching only these fields do not change anything we render.
+IGNORED_UPDATE_FIELDS = frozenset({'last_login'})
+
+
+# Bumped after the commit, so the version row is not locked for the whole
+# transaction and no request stamps uncommitted data with the new version.
+def bump_version(sender, update_fields=None, using=None, **kwargs):
+    if update_fields and IGNORED_UPDATE_FIELDS.issuperset(update_fields):
+        return
+    transaction.on_commit(lambda: ModelVersion.objects.bump(sender),
+                          using=using)
+
+
+def bump_task_version(sender, action, using=None, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(lambda: ModelVersion.objects.bump(Task),
+                              using=using)
+
+
+for model in (Task, Status, Label, get_user_model()):
+    post_save.connect(bump_version, sender=model)
+    post_delete.connect(bump_version, sender=model)
+m2m_changed.connect(bump_task_version, sender=Task.labels.through)
@@ -1,14 +1,27 @@
 from django.contrib import messages
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
+from django.views import View
+from django.views.decorators.cache import never_cache
 from django.views.generic import TemplateView
 
+from task_manager.tasks import rollups
+
 
 class IndexTemplateView(TemplateView):
     template_name = 'index.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            context['dashboard'] = rollups.dashboard()
+        return context
+
 
 class UserLoginView(SuccessMessageMixin, LoginView):
     template_name = 'users/login.html'
@@ -22,3 +35,17 @@ class UserLogoutView(SuccessMessageMixin, LogoutView):
     def dispatch(self, request, *args, **kwargs):
         messages.info(request, _('You are logged out'))
         return super().dispatch(request, *args, **kwargs)
+
+
+@method_decorator(never_cache, name='dispatch')
+class HealthCheckView(View):
+    """Readiness probe: one round trip to every database, no rendering."""
+
+    def get(self, request, *args, **kwargs):
+        try:
+            for connection in connections.all():
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+        except DatabaseError:
+            return JsonResponse({'status': 'unavailable'}, status=503)
+        return JsonResponse({'status': 'ok'})